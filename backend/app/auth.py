@@ -1,12 +1,82 @@
 from jose import jwt, JWTError
 from fastapi import Cookie, HTTPException, Response
 from typing import Optional
+from collections import OrderedDict
+import hashlib
 import os
+import time
+from threading import Lock
+from app.request_timing import phase
 from datetime import datetime, timedelta, timezone
 
 JWT_SECRET = os.getenv("JWT_SECRET", "dev-secret-change-in-production")
 ALGORITHM = "HS256"
 COOKIE_NAME = "sid"
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))  # 0 disables
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU of tokens that already passed jwt.decode.
+
+    Clients resend the same cookie on every request, so a token that verified
+    once maps straight to its username until it expires. Keys are SHA-256
+    digests so raw tokens are never held; anything not cached (tampered,
+    expired, unknown) still goes through jwt.decode.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = Lock()  # sync dependencies run on the threadpool
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def get(self, token: str) -> Optional[str]:
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            username, exp = entry
+            if exp is not None and exp <= time.time():
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return username
+
+    def put(self, token: str, username: str, exp: Optional[float]) -> None:
+        if self.max_size <= 0:
+            return
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            self._entries[key] = (username, exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxSize": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expired": self.expired,
+            }
+
+
+_token_cache = VerifiedTokenCache(TOKEN_CACHE_SIZE)
 
 
 def cookie_secure_enabled() -> bool:
@@ -25,12 +95,23 @@ def create_session_token(username: str) -> str:
 
 def verify_session_token(token: str) -> Optional[str]:
     """Verify JWT token and return username"""
+    username = _token_cache.get(token)
+    if username is not None:
+        return username
     try:
         payload = jwt.decode(token, JWT_SECRET, algorithms=[ALGORITHM])
         username = payload.get("username")
-        return username
     except JWTError:
         return None
+    if username:
+        # decode() already rejected a bad signature or an expired exp
+        exp = payload.get("exp")
+        _token_cache.put(token, username, float(exp) if exp is not None else None)
+    return username
+
+
+def token_cache_stats() -> dict:
+    return _token_cache.stats()
 
 
 def set_session_cookie(response: Response, username: str):
@@ -57,7 +138,8 @@ async def get_current_username(sid: Optional[str] = Cookie(None)) -> str:
     if not sid:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    username = verify_session_token(sid)
+    with phase("auth"):
+        username = verify_session_token(sid)
     if not username:
         raise HTTPException(status_code=401, detail="Invalid session")
     
@@ -68,4 +150,5 @@ def get_optional_username(sid: Optional[str] = Cookie(None)) -> Optional[str]:
     """Get username from cookie without raising exception if not present"""
     if not sid:
         return None
-    return verify_session_token(sid)
+    with phase("auth"):
+        return verify_session_token(sid)
@@ -3,24 +3,81 @@ SQLite persistence for Cozy Aquarium.
 
 The game state is intentionally stored as compact JSON blobs. This keeps the
 single-player-style game data small, migration-friendly, and cheap to load.
+Fish are the exception: they live one row per fish in the ``fish`` table so
+renaming or dressing up a single fish is a single-row write. Users that still
+carry the old ``users.fish`` JSON array are read as before and converted on
+their next save, or in bulk (online) by ``migrate_fish_table.py``.
+
+The database runs in WAL mode with one writer connection (guarded by
+``_lock``) and a small pool of read-only connections, so reads for one player
+never wait behind another player's commit.
 """
 
 from __future__ import annotations
 
+import asyncio
+from contextlib import contextmanager
 from datetime import datetime
 import json
+import logging
 import os
 from pathlib import Path
+import queue
 import sqlite3
-from threading import RLock
-from typing import Any, Optional
+from threading import Lock, RLock
+import time
+from typing import Any, Iterable, Optional
+import uuid
+
+from app.group_commit import GroupCommitWriter
+from app.metrics import Counter, Histogram
+from app.request_timing import phase
+from app.storage_executor import StorageExecutor
+from app.user_cache import UserCache
 
 
 DEFAULT_SQLITE_PATH = "/data/aquarium.sqlite" if Path("/data").exists() else "aquarium.sqlite"
 SQLITE_PATH = os.getenv("SQLITE_PATH", os.getenv("DATABASE_PATH", DEFAULT_SQLITE_PATH))
 
+# Read-only connections served alongside the single writer. 0 sends reads
+# through the writer connection (the old fully serialized behaviour).
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "FULL")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# Storage calls allowed in flight on the executor before callers wait.
+SQLITE_EXECUTOR_QUEUE = int(os.getenv("SQLITE_EXECUTOR_QUEUE", "256"))
+# Group commit: batch writes arriving within this window (or until this many
+# are queued) into one transaction. 0 commits every write on its own.
+SQLITE_GROUP_COMMIT_MS = float(os.getenv("SQLITE_GROUP_COMMIT_MS", "0"))
+SQLITE_GROUP_COMMIT_MAX = int(os.getenv("SQLITE_GROUP_COMMIT_MAX", "64"))
+
+# Write-back user cache. USER_CACHE_SIZE=0 turns it off (write-through).
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+USER_CACHE_FLUSH_SECONDS = float(os.getenv("USER_CACHE_FLUSH_SECONDS", "5"))
+
+logger = logging.getLogger(__name__)
+
 _conn: Optional[sqlite3.Connection] = None
 _lock = RLock()
+_readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+_readers_open = 0
+_readers_lock = Lock()
+_cache = UserCache(USER_CACHE_SIZE)
+_executor = StorageExecutor(SQLITE_READ_POOL_SIZE, SQLITE_EXECUTOR_QUEUE)
+_group_writer = GroupCommitWriter(
+    lambda ops: _executor.run_write(_write_rows, ops),
+    SQLITE_GROUP_COMMIT_MS / 1000,
+    SQLITE_GROUP_COMMIT_MAX,
+)
+_flush_task: Optional[asyncio.Task] = None
+
+# Exported on /metrics (see storage_metric_families)
+_get_user_seconds = Histogram()
+_save_user_seconds = Histogram()
+_lock_wait_seconds = Histogram()
+_lock_hold_seconds = Histogram()
+_rows_written = Counter()
+_json_bytes_written = Counter()
 
 
 def _json_default(value: Any) -> str:
@@ -40,24 +97,101 @@ def _from_json(value: Optional[str], default: Any) -> Any:
 
 
 def _connect() -> sqlite3.Connection:
+    """Return the writer connection, opening it (in WAL mode) on first use."""
     global _conn
     if _conn is None:
         db_path = Path(SQLITE_PATH)
         if db_path.parent and str(db_path.parent) != ".":
             db_path.parent.mkdir(parents=True, exist_ok=True)
-        _conn = sqlite3.connect(str(db_path), check_same_thread=False)
-        _conn.row_factory = sqlite3.Row
+        conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+        _conn = conn
     return _conn
 
 
+@contextmanager
+def _locked():
+    """Hold the writer lock, timing the wait for it and how long it is held."""
+    waiting_since = time.perf_counter()
+    with _lock:
+        acquired = time.perf_counter()
+        _lock_wait_seconds.observe(acquired - waiting_since)
+        try:
+            yield
+        finally:
+            _lock_hold_seconds.observe(time.perf_counter() - acquired)
+
+
+def _open_reader() -> sqlite3.Connection:
+    _connect()  # the writer creates the file and the WAL index first
+    uri = f"{Path(SQLITE_PATH).resolve().as_uri()}?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}")
+    return conn
+
+
+@contextmanager
+def _reader():
+    """Check out a read-only connection from the pool."""
+    global _readers_open
+    if SQLITE_READ_POOL_SIZE <= 0:
+        conn = _connect()
+        with _locked():
+            yield conn
+        return
+
+    try:
+        conn = _readers.get_nowait()
+    except queue.Empty:
+        with _readers_lock:
+            can_open = _readers_open < SQLITE_READ_POOL_SIZE
+            if can_open:
+                _readers_open += 1
+        if can_open:
+            try:
+                conn = _open_reader()
+            except Exception:
+                with _readers_lock:
+                    _readers_open -= 1
+                raise
+        else:
+            conn = _readers.get()
+    try:
+        yield conn
+    finally:
+        _readers.put(conn)
+
+
+def _close_readers() -> None:
+    global _readers_open
+    while True:
+        try:
+            _readers.get_nowait().close()
+        except queue.Empty:
+            break
+    with _readers_lock:
+        _readers_open = 0
+
+
+def _ensure_column(conn: sqlite3.Connection, table: str, column: str, declaration: str) -> None:
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+
 async def connect_to_mongo():
     """Initialize the SQLite database.
 
     The function name is kept as a compatibility alias for the existing app
     startup wiring.
     """
+    global _flush_task
     conn = _connect()
-    with _lock:
+    with _locked():
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS users (
@@ -72,14 +206,49 @@ async def connect_to_mongo():
             )
             """
         )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS fish (
+                username TEXT NOT NULL,
+                fish_id TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                species TEXT,
+                name TEXT,
+                color TEXT,
+                size TEXT,
+                rarity TEXT NOT NULL DEFAULT 'common',
+                accessories TEXT,
+                created_at TEXT,
+                PRIMARY KEY (username, fish_id)
+            )
+            """
+        )
+        # Bumped on every save; lets GET /game answer 304 without loading the user
+        _ensure_column(conn, "users", "version", "INTEGER NOT NULL DEFAULT 0")
+        # Bumped when a fish is renamed or dressed up; keys its cached JSON fragment
+        _ensure_column(conn, "fish", "revision", "INTEGER NOT NULL DEFAULT 0")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_fish_username ON fish (username, position)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_fish_species ON fish (species)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_fish_rarity ON fish (rarity)")
         conn.commit()
 
+    if _cache.enabled and _flush_task is None:
+        _flush_task = asyncio.get_running_loop().create_task(_flush_loop())
+
 
 async def close_mongo_connection():
-    """Close the SQLite connection."""
-    global _conn
+    """Flush cached writes and close the SQLite connection."""
+    global _conn, _flush_task
+    if _flush_task is not None:
+        _flush_task.cancel()
+        _flush_task = None
     if _conn is not None:
-        with _lock:
+        await flush_user_cache()
+        await _group_writer.stop()
+        _cache.clear()
+        _executor.shutdown()
+        _close_readers()
+        with _locked():
             _conn.close()
             _conn = None
 
@@ -93,14 +262,73 @@ def sqlite_path() -> str:
     return SQLITE_PATH
 
 
-def _row_to_user(row: sqlite3.Row) -> dict:
+DEFAULT_ACCESSORIES = {"hat": None, "glasses": None, "effect": None}
+
+# Usernames whose fish were last read from the legacy users.fish JSON array.
+# Their next save replaces every fish row instead of patching single fish.
+_legacy_fish: set[str] = set()
+
+
+# Namespace for ids derived for legacy fish that had none (or a duplicate)
+LEGACY_FISH_NAMESPACE = uuid.UUID("e591a997-5c9d-4bf9-9c20-14b211669678")
+
+
+def _normalize_legacy_fish(username: str, fish_list: list[dict]) -> list[dict]:
+    """Give legacy fish the unique ids the fish table's primary key needs.
+
+    Missing ids are derived from the user and the fish's position, so every
+    read (and the eventual migration) hands out the same id until the fish
+    is saved to its own row.
+    """
+    seen = set()
+    for index, fish in enumerate(fish_list):
+        if not fish.get("id") or fish["id"] in seen:
+            fish["id"] = str(uuid.uuid5(LEGACY_FISH_NAMESPACE, f"{username}:{index}"))
+        seen.add(fish["id"])
+    return fish_list
+
+
+def _row_to_fish(row: sqlite3.Row) -> dict:
+    return {
+        "id": row["fish_id"],
+        "species": row["species"],
+        "name": row["name"],
+        "color": row["color"],
+        "size": row["size"],
+        "rarity": row["rarity"],
+        "accessories": _from_json(row["accessories"], dict(DEFAULT_ACCESSORIES)),
+        "createdAt": row["created_at"],
+        "revision": row["revision"],
+    }
+
+
+def _fish_params(username: str, fish: dict, position: int) -> tuple:
+    accessories = _to_json(fish.get("accessories", DEFAULT_ACCESSORIES))
+    _json_bytes_written.inc(("fish.accessories",), len(accessories))
+    return (
+        username,
+        fish["id"],
+        position,
+        fish.get("species"),
+        fish.get("name"),
+        fish.get("color"),
+        fish.get("size"),
+        fish.get("rarity", "common"),
+        accessories,
+        _json_default(fish["createdAt"]) if fish.get("createdAt") else None,
+        fish.get("revision", 0),
+    )
+
+
+def _row_to_user(row: sqlite3.Row, fish: list[dict]) -> dict:
     user = {
         "username": row["username"],
         "password_hash": row["password_hash"],
         "createdAt": row["created_at"],
         "updatedAt": row["updated_at"],
-        "fish": _from_json(row["fish"], []),
+        "fish": fish,
         "ownedAccessories": _from_json(row["owned_accessories"], []),
+        "version": row["version"],
     }
     game_state = _from_json(row["game_state"], None)
     tank = _from_json(row["tank"], None)
@@ -111,47 +339,412 @@ def _row_to_user(row: sqlite3.Row) -> dict:
     return user
 
 
-async def get_user(username: str) -> Optional[dict]:
-    conn = _connect()
-    with _lock:
-        row = conn.execute(
-            "SELECT * FROM users WHERE username = ?",
-            (username,),
-        ).fetchone()
-    return _row_to_user(row) if row else None
+def _fetch_user(username: str) -> Optional[dict]:
+    with _reader() as conn:
+        # One read transaction so the user row and fish rows are a consistent
+        # snapshot even while a migration moves this user's fish.
+        conn.execute("BEGIN")
+        try:
+            row = conn.execute(
+                "SELECT * FROM users WHERE username = ?",
+                (username,),
+            ).fetchone()
+            if row is None:
+                return None
+            legacy = _from_json(row["fish"], [])
+            fish_rows = [] if legacy else conn.execute(
+                "SELECT * FROM fish WHERE username = ? ORDER BY position",
+                (username,),
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+    with phase("decode"):
+        if legacy:
+            _legacy_fish.add(username)
+            fish = _normalize_legacy_fish(username, legacy)
+        else:
+            fish = [_row_to_fish(fish_row) for fish_row in fish_rows]
+        return _row_to_user(row, fish)
 
 
-async def save_user(user: dict) -> None:
-    conn = _connect()
-    with _lock:
-        conn.execute(
-            """
-            INSERT INTO users (
-                username, password_hash, game_state, tank, fish,
-                owned_accessories, created_at, updated_at
+# Top-level user sections and the column each one is stored in. Routers pass
+# the sections they touched to save_user so only those columns are rewritten.
+# Fish are stored in their own table; see _fish_statements.
+SECTION_COLUMNS = {
+    "password_hash": "password_hash",
+    "gameState": "game_state",
+    "tank": "tank",
+    "fish": None,
+    "ownedAccessories": "owned_accessories",
+}
+
+_UPSERT_USER_SQL = """
+    INSERT INTO users (
+        username, password_hash, game_state, tank, fish,
+        owned_accessories, created_at, updated_at, version
+    )
+    VALUES (?, ?, ?, ?, '[]', ?, ?, ?, ?)
+    ON CONFLICT(username) DO UPDATE SET
+        password_hash = excluded.password_hash,
+        game_state = excluded.game_state,
+        tank = excluded.tank,
+        fish = '[]',
+        owned_accessories = excluded.owned_accessories,
+        created_at = excluded.created_at,
+        updated_at = excluded.updated_at,
+        version = excluded.version
+"""
+
+_UPSERT_FISH_SQL = """
+    INSERT INTO fish (
+        username, fish_id, position, species, name, color, size, rarity,
+        accessories, created_at, revision
+    )
+    VALUES (
+        ?1, ?2,
+        (SELECT COALESCE(MAX(position), -1) + 1 FROM fish WHERE username = ?1),
+        ?4, ?5, ?6, ?7, ?8, ?9, ?10, ?11
+    )
+    ON CONFLICT(username, fish_id) DO UPDATE SET
+        species = excluded.species,
+        name = excluded.name,
+        color = excluded.color,
+        size = excluded.size,
+        rarity = excluded.rarity,
+        accessories = excluded.accessories,
+        created_at = excluded.created_at,
+        revision = excluded.revision
+"""
+
+_INSERT_FISH_SQL = """
+    INSERT INTO fish (
+        username, fish_id, position, species, name, color, size, rarity,
+        accessories, created_at, revision
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _section_value(user: dict, section: str) -> Optional[str]:
+    if section == "password_hash":
+        return user.get("password_hash")
+    if section in ("gameState", "tank"):
+        value = _to_json(user[section]) if section in user else None
+    else:
+        value = _to_json(user.get(section, []))
+    if value is not None:
+        # ASCII-only JSON, so characters are bytes
+        _json_bytes_written.inc((SECTION_COLUMNS[section],), len(value))
+    return value
+
+
+def _replace_fish_statements(user: dict) -> list[tuple]:
+    username = user["username"]
+    return [
+        ("DELETE FROM fish WHERE username = ?", (username,)),
+        ("UPDATE users SET fish = '[]' WHERE username = ?", (username,)),
+        *(
+            (_INSERT_FISH_SQL, _fish_params(username, fish, position))
+            for position, fish in enumerate(user.get("fish", []))
+        ),
+    ]
+
+
+def _fish_statements(user: dict, changed: frozenset) -> list[tuple]:
+    """Statements for the fish part of a save.
+
+    ``"fish"`` in ``changed`` rewrites every row; ``("fish", fish_id)`` entries
+    upsert or delete just that fish.
+    """
+    username = user["username"]
+    if "fish" in changed or username in _legacy_fish:
+        _legacy_fish.discard(username)
+        return _replace_fish_statements(user)
+
+    fish_ids = {entry[1] for entry in changed if isinstance(entry, tuple)}
+    if not fish_ids:
+        return []
+    current = {fish["id"]: fish for fish in user.get("fish", []) if fish["id"] in fish_ids}
+    statements = []
+    for fish_id in sorted(fish_ids):
+        if fish_id in current:
+            statements.append((_UPSERT_FISH_SQL, _fish_params(username, current[fish_id], 0)))
+        else:
+            statements.append(
+                ("DELETE FROM fish WHERE username = ? AND fish_id = ?", (username, fish_id))
             )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(username) DO UPDATE SET
-                password_hash = excluded.password_hash,
-                game_state = excluded.game_state,
-                tank = excluded.tank,
-                fish = excluded.fish,
-                owned_accessories = excluded.owned_accessories,
-                created_at = excluded.created_at,
-                updated_at = excluded.updated_at
-            """,
+    return statements
+
+
+def _write_op(user: dict, changed: Optional[frozenset]) -> list[tuple]:
+    """Serialize one pending write into (sql, params) statements."""
+    username = user["username"]
+    updated_at = _json_default(user.get("updatedAt")) if user.get("updatedAt") else None
+    if changed is None:
+        _legacy_fish.discard(username)
+        return [
             (
-                user["username"],
-                user.get("password_hash"),
-                _to_json(user.get("gameState")) if "gameState" in user else None,
-                _to_json(user.get("tank")) if "tank" in user else None,
-                _to_json(user.get("fish", [])),
-                _to_json(user.get("ownedAccessories", [])),
-                _json_default(user.get("createdAt")) if user.get("createdAt") else None,
-                _json_default(user.get("updatedAt")) if user.get("updatedAt") else None,
+                _UPSERT_USER_SQL,
+                (
+                    username,
+                    _section_value(user, "password_hash"),
+                    _section_value(user, "gameState"),
+                    _section_value(user, "tank"),
+                    _section_value(user, "ownedAccessories"),
+                    _json_default(user.get("createdAt")) if user.get("createdAt") else None,
+                    updated_at,
+                    user.get("version", 0),
+                ),
             ),
-        )
-        conn.commit()
+            *_replace_fish_statements(user),
+        ]
+
+    sections = [s for s, column in SECTION_COLUMNS.items() if column and s in changed]
+    assignments = ", ".join(
+        f"{column} = ?"
+        for column in [SECTION_COLUMNS[s] for s in sections] + ["updated_at", "version"]
+    )
+    return [
+        (
+            f"UPDATE users SET {assignments} WHERE username = ?",
+            (
+                *(_section_value(user, s) for s in sections),
+                updated_at,
+                user.get("version", 0),
+                username,
+            ),
+        ),
+        *_fish_statements(user, changed),
+    ]
+
+
+def _write_rows(ops: list[list[tuple]]) -> None:
+    """Apply serialized write ops in a single transaction."""
+    if not ops:
+        return
+    conn = _connect()
+    with _locked():
+        rows = 0
+        try:
+            for statements in ops:
+                for sql, params in statements:
+                    rows += conn.execute(sql, params).rowcount
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    _rows_written.inc((), rows)
+
+
+def migrate_legacy_fish_batch(batch_size: int = 100) -> int:
+    """Move up to ``batch_size`` users' fish from users.fish JSON into fish rows.
+
+    Safe to run while the app is serving: each batch is one IMMEDIATE
+    transaction, so the app's reads see each user either before or after the
+    move. Returns the number of users migrated.
+    """
+    conn = _connect()
+    with _locked():
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT username, fish FROM users WHERE fish != '[]' LIMIT ?",
+                (batch_size,),
+            ).fetchall()
+            for row in rows:
+                username = row["username"]
+                fish_list = _normalize_legacy_fish(username, _from_json(row["fish"], []))
+                conn.execute("DELETE FROM fish WHERE username = ?", (username,))
+                conn.executemany(
+                    _INSERT_FISH_SQL,
+                    [_fish_params(username, fish, i) for i, fish in enumerate(fish_list)],
+                )
+                conn.execute("UPDATE users SET fish = '[]' WHERE username = ?", (username,))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return len(rows)
+
+
+def legacy_fish_user_count() -> int:
+    with _reader() as conn:
+        return conn.execute("SELECT COUNT(*) FROM users WHERE fish != '[]'").fetchone()[0]
+
+
+def _write_users(users: list[dict], changed: Optional[frozenset] = None) -> None:
+    _write_rows([_write_op(user, changed) for user in users])
+
+
+async def _persist(writes: list[tuple[dict, Optional[frozenset]]]) -> None:
+    # Serialize on the loop thread: cached dicts may be mutated by the next
+    # request while the writer thread is busy.
+    if not writes:
+        return
+    ops = [_write_op(user, changed) for user, changed in writes]
+    if SQLITE_GROUP_COMMIT_MS > 0:
+        await _group_writer.submit(ops)
+    else:
+        await _executor.run_write(_write_rows, ops)
+
+
+async def get_user(username: str) -> Optional[dict]:
+    """Load a user, serving hot users from the write-back cache.
+
+    With the cache enabled the returned dict is shared: mutate it only on the
+    way to ``save_user``.
+    """
+    start = time.perf_counter()
+    try:
+        with phase("db_read"):
+            return await _load_user(username)
+    finally:
+        _get_user_seconds.observe(time.perf_counter() - start)
+
+
+async def _load_user(username: str) -> Optional[dict]:
+    if not _cache.enabled:
+        return await _executor.run_read(_fetch_user, username)
+
+    user = _cache.get(username)
+    if user is not None:
+        return user
+    user = await _executor.run_read(_fetch_user, username)
+    if user is None:
+        return None
+    user, evicted = _cache.adopt(user)
+    await _persist(evicted)
+    return user
+
+
+async def save_user(
+    user: dict,
+    sections: Optional[Iterable[str]] = None,
+    fish_ids: Optional[Iterable[str]] = None,
+) -> None:
+    """Persist a user.
+
+    ``sections`` names the top-level keys that changed (see SECTION_COLUMNS);
+    only those columns plus ``updated_at`` are written. ``None`` writes the
+    whole row and is required for users that may not exist yet. For the
+    ``"fish"`` section, ``fish_ids`` narrows the write to the fish added,
+    changed or removed; fish no longer in ``user["fish"]`` are deleted.
+    """
+    start = time.perf_counter()
+    try:
+        with phase("db_write"):
+            await _save_user(user, sections, fish_ids)
+    finally:
+        _save_user_seconds.observe(time.perf_counter() - start)
+
+
+async def _save_user(
+    user: dict,
+    sections: Optional[Iterable[str]],
+    fish_ids: Optional[Iterable[str]],
+) -> None:
+    changed = None if sections is None else frozenset(sections)
+    if changed is not None and not changed <= SECTION_COLUMNS.keys():
+        raise ValueError(f"Unknown user sections: {sorted(changed - SECTION_COLUMNS.keys())}")
+    if changed is not None and fish_ids is not None and "fish" in changed:
+        # Per-fish changes are tracked as ("fish", fish_id) entries.
+        changed = (changed - {"fish"}) | {("fish", fish_id) for fish_id in fish_ids}
+    _bump_version(user)
+    if not _cache.enabled:
+        await _persist([(user, changed)])
+        return
+    await _persist(_cache.put_dirty(user, changed))
+
+
+def _bump_version(user: dict) -> None:
+    user["version"] = user.get("version", 0) + 1
+
+
+async def save_users(users: list[dict], sections: Iterable[str]) -> None:
+    """Persist the same sections of many users in one write."""
+    changed = frozenset(sections)
+    if not changed <= SECTION_COLUMNS.keys() or "fish" in changed:
+        raise ValueError(f"save_users only takes non-fish sections, got {sorted(changed)}")
+    for user in users:
+        _bump_version(user)
+    if not _cache.enabled:
+        await _persist([(user, changed) for user in users])
+        return
+    evicted = []
+    for user in users:
+        evicted.extend(_cache.put_dirty(user, changed))
+    await _persist(evicted)
+
+
+async def flush_user_cache() -> int:
+    """Write every dirty cached user to SQLite. Returns the number written."""
+    dirty = _cache.take_dirty()
+    try:
+        await _persist(dirty)
+    except Exception:
+        _cache.mark_dirty(dirty)
+        raise
+    return len(dirty)
+
+
+async def _flush_loop() -> None:
+    while True:
+        await asyncio.sleep(USER_CACHE_FLUSH_SECONDS)
+        try:
+            await flush_user_cache()
+        except Exception:
+            logger.exception("User cache flush failed; will retry")
+
+
+def cache_stats() -> dict:
+    return _cache.stats()
+
+
+def storage_stats() -> dict:
+    """Cache and executor health: queue depth and wait time show DB pressure."""
+    stats = {"cache": _cache.stats(), "executor": _executor.stats()}
+    if SQLITE_GROUP_COMMIT_MS > 0:
+        stats["groupCommit"] = _group_writer.stats()
+    return stats
+
+
+def storage_metric_families() -> list:
+    """Storage metrics in the shape app.metrics.render_prometheus takes."""
+    families = _group_writer.metric_families() if SQLITE_GROUP_COMMIT_MS > 0 else []
+    return families + [
+        ("aquarium_get_user_seconds", "get_user latency, cache hits included", (), _get_user_seconds),
+        ("aquarium_save_user_seconds", "save_user latency (write-back saves return before the write)",
+         (), _save_user_seconds),
+        ("aquarium_sqlite_lock_wait_seconds", "Time spent waiting for the SQLite writer lock",
+         (), _lock_wait_seconds),
+        ("aquarium_sqlite_lock_hold_seconds", "Time the SQLite writer lock was held",
+         (), _lock_hold_seconds),
+        ("aquarium_sqlite_rows_written_total", "Rows inserted, updated or deleted", (), _rows_written),
+        ("aquarium_json_bytes_written_total", "Bytes of JSON written, by column",
+         ("column",), _json_bytes_written),
+        ("aquarium_executor_wait_seconds", "Time storage calls queued for the executor",
+         (), _executor.wait_seconds),
+    ]
+
+
+def _fetch_user_version(username: str) -> Optional[int]:
+    with _reader() as conn:
+        row = conn.execute("SELECT version FROM users WHERE username = ?", (username,)).fetchone()
+    return row[0] if row is not None else None
+
+
+async def get_user_version(username: str) -> Optional[int]:
+    """The user's state version (None if there is no such user).
+
+    Cheap: served from the cache, or one indexed column read without decoding
+    any JSON.
+    """
+    if _cache.enabled:
+        user = _cache.peek(username)
+        if user is not None:
+            return user.get("version", 0)
+    with phase("db_read"):
+        return await _executor.run_read(_fetch_user_version, username)
 
 
 async def user_exists(username: str) -> bool:
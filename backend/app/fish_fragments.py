@@ -0,0 +1,108 @@
+"""
+Pre-serialized fish for GET /game.
+
+Fish change far less often than the rest of the game state, so each fish's
+JSON is encoded once and kept in an LRU keyed by (username, fish id) together
+with the fish revision it was encoded at. A /game body is then the rest of the
+snapshot with the cached fragments spliced into its "fish" array.
+
+Every change to a stored fish goes through ``touch_fish`` (bump the revision)
+before the save, and ``forget_fish`` (drop the fragment) once the save went
+through, also for fish that left the tank. The revision is persisted with the
+fish, so a stale copy of the user loaded before a change can never serve or
+overwrite the fragment for the newer fish.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import os
+from threading import Lock
+from typing import Iterable
+
+from app.responses import dumps
+
+
+FISH_FRAGMENT_CACHE_SIZE = int(os.getenv("FISH_FRAGMENT_CACHE_SIZE", "8192"))
+
+
+def fish_to_response(fish: dict) -> dict:
+    """Convert fish dict to response format"""
+    accessories = fish.get("accessories", {"hat": None, "glasses": None, "effect": None})
+    return {
+        "id": fish["id"],
+        "species": fish["species"],
+        "name": fish["name"],
+        "color": fish["color"],
+        "size": fish["size"],
+        "rarity": fish.get("rarity", "common"),
+        "accessories": accessories,
+        "createdAt": fish["createdAt"]
+    }
+
+
+class FishFragmentCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple[str, str], tuple[int, bytes]]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def fragment(self, username: str, fish: dict) -> bytes:
+        """The encoded FishResponse for ``fish``, reused while its revision holds."""
+        if not self.enabled:
+            return dumps(fish_to_response(fish))
+        key = (username, fish["id"])
+        revision = fish.get("revision", 0)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == revision:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        encoded = dumps(fish_to_response(fish))
+        with self._lock:
+            entry = self._entries.get(key)
+            # Don't let a stale copy of the user replace a newer fragment
+            if entry is None or entry[0] <= revision:
+                self._entries[key] = (revision, encoded)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return encoded
+
+    def fish_array(self, username: str, fish_list: Iterable[dict]) -> bytes:
+        return b"[" + b",".join(self.fragment(username, fish) for fish in fish_list) + b"]"
+
+    def forget(self, username: str, fish_id: str) -> None:
+        with self._lock:
+            self._entries.pop((username, fish_id), None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else None,
+        }
+
+
+fish_fragments = FishFragmentCache(FISH_FRAGMENT_CACHE_SIZE)
+
+
+def touch_fish(fish: dict) -> None:
+    """Call after changing a stored fish, before saving it."""
+    fish["revision"] = fish.get("revision", 0) + 1
+
+
+def forget_fish(username: str, fish_id: str) -> None:
+    """Call once a changed or released fish has been saved."""
+    fish_fragments.forget(username, fish_id)
@@ -58,6 +58,17 @@ POOP_CLEANLINESS_PENALTY = 3.0 # Cleanliness % lost per poop on the ground
 MIN_CLEANLINESS = 0.0          # Minimum cleanliness value (can't go below)
 MAX_CLEANLINESS = 100.0        # Maximum cleanliness value
 
+MAX_CATCH_UP_SECONDS = 300     # Most time hunger keeps decaying after the player's last visit
+                               # HIGHER = tanks get hungrier while players are away
+                               # LOWER = more forgiving after a break
+REBASE_AFTER_SECONDS = MAX_CATCH_UP_SECONDS / 2  # How often the server re-saves a tank during continuous play
+                               # Well inside the cap, so a tick arriving a little late
+                               # doesn't lose the decay past MAX_CATCH_UP_SECONDS
+
+GAME_STATE_FRESHNESS_SECONDS = 30  # How long a browser may reuse an unchanged GET /game response
+                                   # Nothing the player did changes in between; only slow
+                                   # hunger decay and new poop can lag by up to this long
+
 
 # ==============================================================================
 # FISH RARITY & VALUES
@@ -100,6 +111,13 @@ RARITY_SPEED = {
 # Controls what you get when you successfully tap a fish
 # ==============================================================================
 
+SPAWN_WAVE_SECONDS = 6         # How long each group of fish silhouettes stays in the lake
+                               # Keep in sync with spawnRefreshMs in the frontend config
+                               # LOWER = constant action, HIGHER = fish feel more scarce
+
+SPAWN_TIMELINE_SECONDS = 60    # How far ahead the lake's spawn timeline is sent
+                               # The lake page asks for a new timeline this often
+
 # These three values should add up to 1.0 (100%)
 CATCH_FISH_CHANCE = 0.85       # 85% chance to catch an actual fish
                                # HIGHER = more fish, faster tank filling
@@ -247,5 +265,6 @@ BONUS_COINS_ALL_COSMETICS = 50  # Coins given if player catches cosmetic but own
 #
 # The backend tick handler calculates time deltas based on lastActiveAt,
 # so infrequent ticks are perfectly fine. All decay/generation is time-based,
-# not tick-based.
+# not tick-based: the current tank is derived on read (app/simulation.py) and
+# only saved when the player acts or every REBASE_AFTER_SECONDS of play.
 #
@@ -0,0 +1,142 @@
+"""
+Group commit for SQLite writes.
+
+Every commit pays an fsync, so at peak one commit per tick per player is the
+dominant storage cost. In group-commit mode, writes are queued to a single
+writer task that gathers everything arriving within a short window (or until
+the batch is full) and applies it as one transaction. Each caller's await
+resolves only once its batch has committed.
+
+The callers are whoever persists users: request saves when the user cache is
+off, but only the cache's flushes and evictions when it is on, so requests
+wait for durability only with USER_CACHE_SIZE=0.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from app.metrics import Histogram
+
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitWriter:
+    def __init__(
+        self,
+        apply_batch: Callable[[list], Awaitable[None]],
+        window_seconds: float,
+        max_batch: int,
+    ):
+        self._apply_batch = apply_batch
+        self.window_seconds = window_seconds
+        self.max_batch = max(1, max_batch)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.commit_seconds = Histogram()
+
+    async def submit(self, ops: list) -> None:
+        """Queue write ops and wait until the batch containing them commits."""
+        if not ops:
+            return
+        self._ensure_running()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((ops, future, time.perf_counter()))
+        await future
+
+    def _ensure_running(self) -> None:
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            size = len(first[0])
+            deadline = loop.time() + self.window_seconds
+            stopping = False
+            while size < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                size += len(item[0])
+            await self._commit(batch)
+            if stopping:
+                return
+
+    async def _commit(self, batch: list) -> None:
+        ops = [op for item in batch for op in item[0]]
+        try:
+            await self._apply_batch(ops)
+            failures = {}
+        except Exception as exc:
+            if len(batch) == 1:
+                failures = {0: exc}
+            else:
+                # One bad write must not fail its neighbours: retry one by one.
+                logger.warning("Group commit of %d writes failed; retrying individually", len(ops))
+                failures = {}
+                for index, (item_ops, _, _) in enumerate(batch):
+                    try:
+                        await self._apply_batch(item_ops)
+                    except Exception as item_exc:
+                        failures[index] = item_exc
+
+        self.batch_sizes.observe(len(ops))
+        finished = time.perf_counter()
+        for index, (_, future, enqueued_at) in enumerate(batch):
+            self.commit_seconds.observe(finished - enqueued_at)
+            if future.done():
+                continue
+            if index in failures:
+                future.set_exception(failures[index])
+            else:
+                future.set_result(None)
+
+    async def stop(self) -> None:
+        """Commit anything still queued, then stop the writer task."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            self._queue.put_nowait(_STOP)
+            await self._task
+        self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "windowSeconds": self.window_seconds,
+            "maxBatch": self.max_batch,
+            "batchSize": self.batch_sizes.snapshot(),
+            "commitSeconds": self.commit_seconds.snapshot(),
+        }
+
+    def metric_families(self) -> list:
+        return [
+            ("aquarium_group_commit_batch_size", "Writes committed per group-commit transaction",
+             (), self.batch_sizes),
+            ("aquarium_group_commit_seconds", "Group-commit latency, from queueing to commit",
+             (), self.commit_seconds),
+        ]
@@ -0,0 +1,40 @@
+"""
+Conditional GET helpers.
+
+Handlers compute an ETag from the versions their response depends on and
+answer 304 before doing the rest of the work when the client already has it.
+Responses are marked ``private, no-cache`` so browsers keep them but always
+revalidate, which fetch() does transparently, and ``Vary: Cookie`` since the
+body belongs to whoever's session cookie was sent.
+"""
+
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+CACHE_CONTROL = "private, no-cache"
+VARY = "Cookie"
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for GET)"""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = _opaque(etag)
+    return any(_opaque(tag.strip()) == wanted for tag in header.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag))
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": VARY}
@@ -0,0 +1,70 @@
+"""
+Request metrics for /metrics.
+
+A plain ASGI middleware (no BaseHTTPMiddleware, so responses are not
+buffered or copied) times every HTTP request and counts it by method, route
+template and status code. Route templates (``/fish/{fish_id}/name``) come
+from the route FastAPI matched, so label cardinality stays bounded; requests
+that match no route are counted as ``<unmatched>``.
+
+The request's scope is also left in ``current_scope`` so code running on the
+loop (see app.loop_monitor) can tell which route it is working for.
+"""
+
+from __future__ import annotations
+
+from contextvars import ContextVar
+import time
+from typing import Optional
+
+from app.metrics import Counter, HistogramFamily
+
+
+_requests = Counter()
+_request_seconds = HistogramFamily()
+
+current_scope: ContextVar[Optional[dict]] = ContextVar("current_scope", default=None)
+
+
+def route_template(scope: dict) -> str:
+    # The router writes the matched route into the request's scope
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        # Not reset: uvicorn runs each request in its own task and context
+        current_scope.set(scope)
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            template = route_template(scope)
+            method = scope["method"]
+            _request_seconds.labels(method, template).observe(time.perf_counter() - start)
+            _requests.inc((method, template, str(status)))
+
+
+def http_metric_families() -> list:
+    return [
+        ("aquarium_http_requests_total", "HTTP requests by route template and status",
+         ("method", "route", "status"), _requests),
+        ("aquarium_http_request_seconds", "HTTP request latency by route template",
+         ("method", "route"), _request_seconds),
+    ]
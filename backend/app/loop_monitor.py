@@ -0,0 +1,136 @@
+"""
+Event-loop lag and slow-callback monitoring.
+
+Everything the app does on the loop thread (request handling, JSON encoding,
+the in-memory game logic) delays every other request while it runs. Two
+probes show when that happens:
+
+- A sampler sleeps LOOP_LAG_SAMPLE_SECONDS at a time and records how late it
+  woke up. That scheduling delay is what every ready request waited too.
+- Opt-in (SLOW_CALLBACK_MS > 0, off by default): every loop callback is
+  timed, and one that holds the loop for longer than SLOW_CALLBACK_MS is
+  logged and counted with the route of the request it ran for (taken from
+  the scope app.http_metrics leaves in ``current_scope``).
+
+The sampler is cheap and always on. Callbacks are timed by wrapping
+asyncio's private ``Handle._run`` for the whole process, which adds a little
+to every callback and only works on the stock asyncio loop (uvloop handles
+are not Python objects), so turn it on while chasing a stall rather than
+leaving it on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from asyncio import events
+import logging
+import os
+import time
+from typing import Optional
+
+from app.http_metrics import current_scope, route_template
+from app.metrics import Counter, Histogram
+
+
+LOOP_LAG_SAMPLE_SECONDS = float(os.getenv("LOOP_LAG_SAMPLE_SECONDS", "0.5"))
+SLOW_CALLBACK_MS = float(os.getenv("SLOW_CALLBACK_MS", "0"))
+
+logger = logging.getLogger(__name__)
+
+
+def _describe(callback) -> str:
+    # Task steps are wrappers bound to their task; name the coroutine instead
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        return f"task {owner.get_name()} ({owner.get_coro().__qualname__})"
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+class LoopMonitor:
+    def __init__(self, sample_seconds: float, slow_callback_ms: float):
+        self.sample_seconds = sample_seconds
+        self.slow_callback_seconds = slow_callback_ms / 1000
+        self.lag_seconds = Histogram()
+        self.max_lag = 0.0
+        self.slow_callbacks = Counter()
+        self._task: Optional[asyncio.Task] = None
+        self._original_run = None
+
+    async def _sample(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.sample_seconds
+            await asyncio.sleep(self.sample_seconds)
+            lag = max(0.0, time.perf_counter() - expected)
+            self.lag_seconds.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def _slow_callback(self, handle: events.Handle, elapsed: float) -> None:
+        context = getattr(handle, "_context", None)
+        scope = context.get(current_scope) if context is not None else None
+        if scope is None:
+            route, where = "<none>", "outside a request"
+        else:
+            route = route_template(scope)
+            where = f"{scope['method']} {scope['path']} (route {route})"
+        self.slow_callbacks.inc((route,))
+        logger.warning(
+            "Slow callback held the event loop for %.0f ms %s: %s",
+            elapsed * 1000, where, _describe(handle._callback),
+        )
+
+    def _install_callback_timer(self) -> None:
+        monitor = self
+        original_run = events.Handle._run
+        threshold = self.slow_callback_seconds
+
+        def timed_run(handle):
+            start = time.perf_counter()
+            original_run(handle)
+            elapsed = time.perf_counter() - start
+            if elapsed >= threshold:
+                monitor._slow_callback(handle, elapsed)
+
+        self._original_run = original_run
+        events.Handle._run = timed_run
+
+    def start(self) -> None:
+        if self.slow_callback_seconds > 0 and self._original_run is None:
+            self._install_callback_timer()
+        # A sampler left behind by a loop that has since closed is replaced
+        if self._task is not None and self._task.get_loop().is_closed():
+            self._task = None
+        if self.sample_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._sample())
+
+    async def stop(self) -> None:
+        if self._original_run is not None:
+            events.Handle._run = self._original_run
+            self._original_run = None
+        # Only the loop that started the sampler stops it (test clients each
+        # run their own loop)
+        if self._task is not None and self._task.get_loop() is asyncio.get_running_loop():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "maxLagSeconds": self.max_lag,
+            "lagSeconds": self.lag_seconds.snapshot(),
+            "slowCallbacks": {route: count for (route,), count in self.slow_callbacks.snapshot().items()},
+            "slowCallbackMs": self.slow_callback_seconds * 1000,
+        }
+
+    def metric_families(self) -> list:
+        return [
+            ("aquarium_event_loop_lag_seconds", "How late the loop ran a sleeping sampler",
+             (), self.lag_seconds),
+            ("aquarium_slow_callbacks_total", "Loop callbacks slower than SLOW_CALLBACK_MS, by route",
+             ("route",), self.slow_callbacks),
+        ]
+
+
+loop_monitor = LoopMonitor(LOOP_LAG_SAMPLE_SECONDS, SLOW_CALLBACK_MS)
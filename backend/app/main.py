@@ -1,16 +1,31 @@
-from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, Request, HTTPException, Header
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import connect_to_mongo, close_mongo_connection
+from app.database import (
+    connect_to_mongo, close_mongo_connection, storage_metric_families, storage_stats
+)
+from app.http_metrics import MetricsMiddleware, http_metric_families
+from app.loop_monitor import loop_monitor
+from app.metrics import render_prometheus
+from app.request_timing import SERVER_TIMING, ServerTimingMiddleware
+from app.passwords import password_pool_stats, shutdown_password_pool
+from app.auth import token_cache_stats
+from app.fish_fragments import fish_fragments
+from app.pending_catches import pending_catches
+from app import static_assets
+from app.sync_log import sync_log
+from app.tank_stream import tank_streams
+from app.tick_engine import start_tick_engine, stop_tick_engine, tick_engine_stats
 from app.routers import sessions, game, fishing, shop
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+import hmac
 import os
-from pathlib import Path
+from typing import Optional
 
 # Rate limiter setup
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=get_remote_address, enabled=sessions.RATE_LIMIT_ENABLED)
 
 app = FastAPI(title="Cozy Aquarium Game API")
 app.state.limiter = limiter
@@ -18,6 +33,8 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 # CORS configuration
 ALLOWED_ORIGIN = os.getenv("ALLOWED_ORIGIN", "http://localhost:5173")
+# Bearer token the Prometheus scraper sends; /metrics is off without one
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[ALLOWED_ORIGIN],
@@ -25,16 +42,26 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if SERVER_TIMING:
+    app.add_middleware(ServerTimingMiddleware)
+# Outermost, so request timings include the other middleware
+app.add_middleware(MetricsMiddleware)
 
 
 @app.on_event("startup")
 async def startup_event():
+    loop_monitor.start()
     await connect_to_mongo()
+    await start_tick_engine()
+    static_assets.load_static_assets()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await stop_tick_engine()
     await close_mongo_connection()
+    shutdown_password_pool()
+    await loop_monitor.stop()
 
 
 # Include routers with /api prefix
@@ -45,10 +72,10 @@ app.include_router(shop.router, prefix="/api", tags=["shop"])
 
 
 @app.get("/")
-async def root():
-    static_index = Path(os.getenv("STATIC_DIR", "/app/static")) / "index.html"
-    if static_index.exists():
-        return FileResponse(static_index, headers={"Cache-Control": "no-cache"})
+async def root(request: Request):
+    index = static_assets.manifest.index
+    if index is not None:
+        return index.response(request)
     return {"status": "ok", "version": "3.0", "name": "Cozy Aquarium Game"}
 
 
@@ -57,26 +84,61 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus scrape endpoint, for requests bearing METRICS_TOKEN"""
+    if not METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    expected = f"Bearer {METRICS_TOKEN}"
+    if authorization is None or not hmac.compare_digest(authorization.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return PlainTextResponse(
+        render_prometheus(
+            http_metric_families() + storage_metric_families() + loop_monitor.metric_families()
+        ),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
+@app.get("/health/storage")
+async def health_storage():
+    """Storage queue depth, wait times and cache hit rates"""
+    stats = {
+        **storage_stats(),
+        "passwordPool": password_pool_stats(),
+        "tokenCache": token_cache_stats(),
+        "pendingCatches": pending_catches.stats(),
+        "syncLog": sync_log.stats(),
+        "fishFragments": fish_fragments.stats(),
+        "tankStreams": tank_streams.stats(),
+        "eventLoop": loop_monitor.stats(),
+    }
+    engine = tick_engine_stats()
+    if engine is not None:
+        stats["tickEngine"] = engine
+    return stats
+
+
 @app.get("/{full_path:path}")
-async def serve_spa(full_path: str):
+async def serve_spa(full_path: str, request: Request):
     """Serve the built React app in the single-container production image."""
     if full_path.startswith("api/"):
         raise HTTPException(status_code=404, detail="Not found")
 
-    static_dir = Path(os.getenv("STATIC_DIR", "/app/static")).resolve()
-    index_file = static_dir / "index.html"
-    requested = (static_dir / full_path).resolve()
-
-    if not index_file.exists():
+    # Answered from the manifest built at startup; no filesystem lookups
+    manifest = static_assets.manifest
+    if manifest.index is None:
         raise HTTPException(status_code=404, detail="Not found")
 
-    if requested.is_file() and static_dir in requested.parents:
-        headers = {}
-        if full_path.startswith("assets/"):
-            headers["Cache-Control"] = "public, max-age=31536000, immutable"
-        return FileResponse(requested, headers=headers)
+    asset = manifest.get(full_path)
+    if asset is not None:
+        return asset.response(request)
 
     if full_path.startswith("assets/"):
         raise HTTPException(status_code=404, detail="Asset not found")
 
-    return FileResponse(index_file, headers={"Cache-Control": "no-cache"})
+    return manifest.index.response(request)
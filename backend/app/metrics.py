@@ -0,0 +1,121 @@
+"""
+Lightweight in-process metrics primitives.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from threading import Lock
+
+
+# Latency buckets in seconds, tuned for SQLite and request timings.
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram, safe to observe from worker threads."""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def snapshot(self) -> dict:
+        """Cumulative bucket counts keyed by upper bound, Prometheus-style."""
+        with self._lock:
+            counts = list(self._counts)
+            count, total = self.count, self.sum
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            buckets["+Inf" if bound == float("inf") else repr(bound)] = cumulative
+        return {"count": count, "sum": total, "buckets": buckets}
+
+
+class Counter:
+    """Monotonic counters keyed by a tuple of label values."""
+
+    def __init__(self):
+        self._values: dict[tuple, float] = {}
+        self._lock = Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def snapshot(self) -> dict[tuple, float]:
+        with self._lock:
+            return dict(self._values)
+
+
+class HistogramFamily:
+    """One Histogram per tuple of label values, created on first use."""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self._buckets = buckets
+        self._histograms: dict[tuple, Histogram] = {}
+        self._lock = Lock()
+
+    def labels(self, *values: str) -> Histogram:
+        histogram = self._histograms.get(values)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(values, Histogram(self._buckets))
+        return histogram
+
+    def snapshot(self) -> dict[tuple, dict]:
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {values: histogram.snapshot() for values, histogram in histograms.items()}
+
+
+# (name, help, label names, Counter | HistogramFamily | Histogram)
+MetricFamily = tuple
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple, le: str = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render_prometheus(families: list[MetricFamily]) -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for name, help_text, label_names, metric in families:
+        if isinstance(metric, Counter):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for values, value in sorted(metric.snapshot().items()):
+                lines.append(f"{name}{_labels(label_names, values)} {value:g}")
+            continue
+
+        if isinstance(metric, Histogram):
+            snapshots = {(): metric.snapshot()}
+        else:
+            snapshots = metric.snapshot()
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for values, snapshot in sorted(snapshots.items()):
+            for bound, count in snapshot["buckets"].items():
+                lines.append(f"{name}_bucket{_labels(label_names, values, bound)} {count}")
+            lines.append(f"{name}_sum{_labels(label_names, values)} {snapshot['sum']:g}")
+            lines.append(f"{name}_count{_labels(label_names, values)} {snapshot['count']}")
+    return "\n".join(lines) + "\n"
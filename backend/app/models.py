@@ -3,7 +3,7 @@ Data Models for Cozy Aquarium Game
 """
 
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
+from typing import Annotated, List, Literal, Optional, Union
 from datetime import datetime, timezone
 from enum import Enum
 from passlib.context import CryptContext
@@ -168,6 +168,17 @@ class GameStateResponse(BaseModel):
     happiness: float  # Calculated: (hunger + cleanliness) / 2
 
 
+class TickResponse(BaseModel):
+    """Current meters returned by a game tick"""
+    hunger: float
+    cleanliness: float
+    happiness: float
+    coins: int
+    maxFish: int
+    poopCount: int
+    poopPositions: List[PoopPosition]
+
+
 class FeedResponse(BaseModel):
     """Response after feeding"""
     success: bool
@@ -193,8 +204,15 @@ class FishingSpawn(BaseModel):
     species: str
     rarity: Rarity
     x: float
+    y: float
     speed: float
     direction: int  # 1 = right, -1 = left
+    size: FishSize
+
+
+class FishingSpawnsResponse(BaseModel):
+    """Fish silhouettes currently in the lake"""
+    spawns: List[FishingSpawn]
 
 
 class CatchResult(BaseModel):
@@ -208,8 +226,8 @@ class CatchResult(BaseModel):
 
 
 class KeepFishRequest(BaseModel):
-    """Request to keep a caught fish"""
-    fishId: str  # ID of caught fish to keep
+    """Request to keep (or release) a caught fish"""
+    fishId: str  # ID of caught fish to keep, from the catch result
 
 
 class SwapFishRequest(BaseModel):
@@ -233,6 +251,12 @@ class ShopItem(BaseModel):
     catchOnly: bool = False
 
 
+class ShopItemsResponse(BaseModel):
+    """Shop items with ownership status and the player's coins"""
+    items: List[ShopItem]
+    coins: int
+
+
 class PurchaseRequest(BaseModel):
     """Request to purchase an item"""
     itemId: str
@@ -257,6 +281,51 @@ class RenameFishRequest(BaseModel):
         return trimmed
 
 
+# ============================================
+# BATCHED ACTIONS
+# ============================================
+
+class RemovePoopAction(BaseModel):
+    type: Literal["removePoop"]
+    poopId: str
+
+
+class FeedAction(BaseModel):
+    type: Literal["feed"]
+
+
+class RenameFishAction(RenameFishRequest):
+    type: Literal["renameFish"]
+    fishId: str
+
+
+class ApplyAccessoryAction(ApplyAccessoryRequest):
+    type: Literal["applyAccessory"]
+    fishId: str
+
+
+class ReleaseFishAction(BaseModel):
+    type: Literal["releaseFish"]
+    fishId: str
+
+
+GameAction = Annotated[
+    Union[RemovePoopAction, FeedAction, RenameFishAction, ApplyAccessoryAction, ReleaseFishAction],
+    Field(discriminator="type"),
+]
+
+
+class GameActionsRequest(BaseModel):
+    """Actions applied in order; either all of them happen or none do"""
+    actions: List[GameAction] = Field(..., min_length=1, max_length=50)
+
+
+class GameActionsResponse(BaseModel):
+    """One result per action, shaped like the matching single-action route's response"""
+    success: bool
+    results: List[dict]
+
+
 # ============================================
 # LEGACY MODELS (for migration compatibility)
 # ============================================
@@ -0,0 +1,80 @@
+"""
+Bounded worker pool for bcrypt.
+
+Hashing or verifying a password is tens of milliseconds of pure CPU, so doing
+it inside an async handler freezes ticks and fishing for every other player.
+The work runs on a small thread pool instead (bcrypt releases the GIL), and
+admission is capped: when every worker is busy and the wait queue is full,
+callers get a fast 503 with Retry-After rather than piling up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException
+
+from app.models import hash_password, verify_password
+from app.request_timing import phase
+
+
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", "2"))
+PASSWORD_QUEUE = int(os.getenv("PASSWORD_QUEUE", "8"))  # calls allowed to wait for a worker
+PASSWORD_RETRY_AFTER_SECONDS = int(os.getenv("PASSWORD_RETRY_AFTER_SECONDS", "2"))
+
+_pool: Optional[ThreadPoolExecutor] = None
+_in_flight = 0  # only touched on the event loop thread
+rejected = 0
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max(1, PASSWORD_WORKERS), thread_name_prefix="bcrypt")
+    return _pool
+
+
+async def _run(fn: Callable[..., Any], *args: Any) -> Any:
+    global _in_flight, rejected
+    if _in_flight >= max(1, PASSWORD_WORKERS) + PASSWORD_QUEUE:
+        rejected += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Too many sign-ins right now, please try again shortly",
+            headers={"Retry-After": str(PASSWORD_RETRY_AFTER_SECONDS)},
+        )
+    _in_flight += 1
+    try:
+        with phase("auth"):
+            return await asyncio.get_running_loop().run_in_executor(_get_pool(), fn, *args)
+    finally:
+        _in_flight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bcrypt pool"""
+    return await _run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bcrypt pool"""
+    return await _run(verify_password, plain_password, hashed_password)
+
+
+def password_pool_stats() -> dict:
+    return {
+        "workers": max(1, PASSWORD_WORKERS),
+        "maxQueue": PASSWORD_QUEUE,
+        "inFlight": _in_flight,
+        "rejected": rejected,
+    }
+
+
+def shutdown_password_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False)
+        _pool = None
@@ -0,0 +1,91 @@
+"""
+Short-lived store of caught fish waiting for keep / release / swap.
+
+``attempt_catch`` parks the fish it rolled here under its id, and the
+follow-up call only sends that id back. The server's copy is the one that
+lands in the tank or is turned into coins, so clients can't rewrite a fish's
+rarity on the way. Entries expire after PENDING_CATCH_TTL_SECONDS, each
+player keeps at most PENDING_CATCHES_PER_USER (oldest dropped first), and
+the whole store is capped at PENDING_CATCHES_MAX.
+
+Like the user cache, it lives in the single worker process and only runs on
+the event loop thread.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import os
+import time
+from typing import Optional
+
+
+PENDING_CATCH_TTL_SECONDS = float(os.getenv("PENDING_CATCH_TTL_SECONDS", "600"))
+PENDING_CATCHES_PER_USER = int(os.getenv("PENDING_CATCHES_PER_USER", "5"))
+PENDING_CATCHES_MAX = int(os.getenv("PENDING_CATCHES_MAX", "10000"))
+
+
+class PendingCatches:
+    def __init__(self, ttl_seconds: float, per_user: int, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.per_user = max(1, per_user)
+        self.max_size = max(1, max_size)
+        # catch id -> (username, fish, expires_at), oldest first
+        self._entries: "OrderedDict[str, tuple[str, dict, float]]" = OrderedDict()
+        self._by_user: dict[str, list[str]] = {}
+        self.expired = 0
+        self.dropped = 0
+
+    def put(self, username: str, catch_id: str, fish: dict) -> None:
+        now = time.monotonic()
+        self._purge(now)
+        ids = self._by_user.setdefault(username, [])
+        while len(ids) >= self.per_user:
+            self._remove(ids[0])
+            self.dropped += 1
+        self._entries[catch_id] = (username, fish, now + self.ttl_seconds)
+        ids.append(catch_id)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+            self.dropped += 1
+
+    def take(self, username: str, catch_id: str) -> Optional[dict]:
+        """Remove and return a player's pending fish, or None if unknown or expired."""
+        entry = self._entries.get(catch_id)
+        if entry is None or entry[0] != username:
+            return None
+        self._remove(catch_id)
+        if entry[2] <= time.monotonic():
+            self.expired += 1
+            return None
+        return entry[1]
+
+    def _remove(self, catch_id: str) -> None:
+        username, _, _ = self._entries.pop(catch_id)
+        ids = self._by_user[username]
+        ids.remove(catch_id)
+        if not ids:
+            del self._by_user[username]
+
+    def _purge(self, now: float) -> None:
+        # Entries share one TTL, so insertion order is expiry order
+        while self._entries:
+            catch_id, (_, _, expires_at) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            self._remove(catch_id)
+            self.expired += 1
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "players": len(self._by_user),
+            "expired": self.expired,
+            "dropped": self.dropped,
+        }
+
+
+pending_catches = PendingCatches(
+    PENDING_CATCH_TTL_SECONDS, PENDING_CATCHES_PER_USER, PENDING_CATCHES_MAX
+)
@@ -0,0 +1,137 @@
+"""
+Per-request phase timing: the Server-Timing header and a JSON access log.
+
+Opt-in with SERVER_TIMING=true. Storage and response code mark their work
+with ``phase(name)``:
+
+- auth: session token checks and bcrypt (queueing for the pool included)
+- db_read / db_write: get_user / save_user (cache hits and write-back saves
+  included, so a fast db_write means the save was deferred)
+- decode: turning SQLite rows into the user dict (on the storage threads)
+- serialize: encoding the response body
+- logic: everything else the request spent, i.e. route code and framework
+
+Phases are exclusive: a decode inside a db_read is not counted twice. Each
+response gets ``Server-Timing: auth;dur=0.04, db_read;dur=0.61, ...`` (in
+milliseconds, shown in the browser devtools' Timing tab), and one JSON line
+per request goes to the ``app.access`` logger on stdout.
+
+With SERVER_TIMING off the middleware is not installed and ``phase`` is a
+context-variable lookup.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import logging
+import os
+import sys
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from app.http_metrics import route_template
+
+
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
+
+access_logger = logging.getLogger("app.access")
+
+
+class RequestTimings:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def breakdown(self) -> dict[str, float]:
+        """Phase durations in ms, with the unaccounted rest as ``logic``"""
+        total = time.perf_counter() - self.start
+        phases = dict(self.phases)
+        phases["logic"] = max(0.0, total - sum(phases.values()))
+        phases["total"] = total
+        return {name: round(seconds * 1000, 3) for name, seconds in phases.items()}
+
+
+_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+# Time spent in phases nested inside the innermost open phase
+_nested: ContextVar[Optional[list]] = ContextVar("request_timing_nested", default=None)
+
+
+@contextmanager
+def phase(name: str):
+    """Count the time spent in this block toward ``name`` for the current request."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    parent = _nested.get()
+    nested = [0.0]
+    token = _nested.set(nested)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _nested.reset(token)
+        timings.add(name, elapsed - nested[0])
+        if parent is not None:
+            parent[0] += elapsed
+
+
+def _server_timing(breakdown: dict[str, float]) -> str:
+    return ", ".join(f"{name};dur={ms}" for name, ms in breakdown.items())
+
+
+def _configure_access_log() -> None:
+    if access_logger.handlers:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    access_logger.addHandler(handler)
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app):
+        self.app = app
+        _configure_access_log()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        _timings.set(timings)
+        status = 500
+        sent = None
+
+        async def send_with_timing(message):
+            nonlocal status, sent
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # The body is built before the response starts, so this is
+                # the whole request as far as the handler is concerned
+                sent = timings.breakdown()
+                MutableHeaders(scope=message).append("Server-Timing", _server_timing(sent))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            access_logger.info(json.dumps({
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route_template(scope),
+                "status": status,
+                "durationMs": round((time.perf_counter() - timings.start) * 1000, 3),
+                # Streams keep running after the header goes out
+                "phasesMs": timings.breakdown() if sent is None else sent,
+            }, separators=(",", ":")))
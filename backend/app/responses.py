@@ -0,0 +1,75 @@
+"""
+Fast JSON responses for hot routes.
+
+The game, tick and spawn routes return dicts built from our own stored state,
+already shaped like their response models. Instead of letting FastAPI
+re-validate them against the model and walk them with jsonable_encoder, they
+return ``fast_json(...)``, which encodes the dict directly with orjson (or
+the stdlib json module when orjson isn't installed).
+
+Set VALIDATE_RESPONSES=true (in development and when testing) to check each
+body against its response model before it is sent.
+"""
+
+from datetime import date, datetime
+from enum import Enum
+import json
+import os
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from app.request_timing import phase
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+
+VALIDATE_RESPONSES = os.getenv("VALIDATE_RESPONSES", "false").lower() == "true"
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    with phase("serialize"):
+        if orjson is not None:
+            return orjson.dumps(content, default=_default)
+        return json.dumps(
+            content, default=_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def raw_json(
+    body: bytes,
+    model: Optional[type[BaseModel]] = None,
+    headers: Optional[dict] = None,
+) -> Response:
+    """Send an already-encoded JSON ``body``; checked like ``fast_json``."""
+    if VALIDATE_RESPONSES and model is not None:
+        model.model_validate_json(body)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def fast_json(
+    content: Any,
+    model: Optional[type[BaseModel]] = None,
+    headers: Optional[dict] = None,
+) -> FastJSONResponse:
+    """Send ``content`` as-is; ``model`` is only checked with VALIDATE_RESPONSES."""
+    if VALIDATE_RESPONSES and model is not None:
+        model.model_validate(content)
+    return FastJSONResponse(content, headers=headers)
@@ -5,29 +5,44 @@ Fishing Router - Lake minigame for catching fish
 from fastapi import APIRouter, Depends, HTTPException, Query
 from app.auth import get_current_username
 from app.database import get_user, save_user
-from app.models import FishResponse, now_utc
+from app.models import (
+    FishResponse, FishingSpawnsResponse, FishSize, KeepFishRequest, Rarity, SwapFishRequest,
+    now_utc
+)
+from app.pending_catches import pending_catches
+from app.fish_fragments import fish_to_response, forget_fish
+from app.responses import fast_json
 from app.game_config import (
-    RARITY_WEIGHTS, RARITY_COIN_VALUES, RARITY_SPEED,
-    CATCH_FISH_CHANCE, CATCH_JUNK_CHANCE, CATCH_COSMETIC_CHANCE,
-    FISH_SPECIES, JUNK_ITEMS, CATCHABLE_COSMETICS,
-    BONUS_COINS_ALL_COSMETICS
+    RARITY_COIN_VALUES, JUNK_ITEMS, CATCHABLE_COSMETICS,
+    BONUS_COINS_ALL_COSMETICS, SPAWN_WAVE_SECONDS, SPAWN_TIMELINE_SECONDS
+)
+from app.sampler import (
+    RARITY_TABLE, CATCH_OUTCOME_TABLE, spawn_buffer, spawn_wave
 )
+from app.simulation import materialize
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+import time
 import uuid
 import random
 
 router = APIRouter()
 
+# Spawn timelines: only (seed, epoch) per player is kept; waves are rederived
+MAX_SPAWN_TIMELINES = 10000
+_timelines: "OrderedDict[str, tuple[int, float]]" = OrderedDict()
+# Timeline spawns already caught, as (seed, wave, spawn id), for the live waves
+_timeline_catches: dict[str, set[tuple[int, int, str]]] = {}
+# Spawns handed out by GET /fishing/spawn that haven't been caught yet
+MAX_SPAWN_PLAYERS = 10000
+RECENT_SPAWNS_PER_PLAYER = 12
+_recent_spawns: "OrderedDict[str, OrderedDict[str, dict]]" = OrderedDict()
+
 
 def weighted_rarity_choice():
     """Select a rarity based on weights"""
-    total = sum(RARITY_WEIGHTS.values())
-    r = random.uniform(0, total)
-    cumulative = 0
-    for rarity, weight in RARITY_WEIGHTS.items():
-        cumulative += weight
-        if r <= cumulative:
-            return rarity
-    return "common"
+    return RARITY_TABLE.sample()
 
 
 def generate_fish_name(species: str) -> str:
@@ -52,53 +67,128 @@ def generate_fish_color() -> str:
     return random.choice(colors)
 
 
-@router.get("/fishing/spawn")
+@router.get("/fishing/spawn", response_model=FishingSpawnsResponse)
 async def get_fishing_spawns(username: str = Depends(get_current_username)):
     """Get current fish silhouettes swimming in the lake"""
     # Generate 3-6 fish silhouettes
-    count = random.randint(3, 6)
-    spawns = []
+    spawns = spawn_buffer.take(random.randint(3, 6))
+    _remember_spawns(username, spawns)
     
-    for i in range(count):
-        rarity = weighted_rarity_choice()
-        species = random.choice(FISH_SPECIES)
-        direction = random.choice([-1, 1])
-        
-        spawns.append({
-            "id": str(uuid.uuid4()),
-            "species": species,
-            "rarity": rarity,
-            "x": random.uniform(0.1, 0.9) if direction == 1 else random.uniform(0.1, 0.9),
-            "y": random.uniform(0.2, 0.8),
-            "speed": RARITY_SPEED[rarity],
-            "direction": direction,
-            "size": random.choice(["sm", "md", "lg"])
-        })
+    return fast_json({"spawns": spawns}, FishingSpawnsResponse)
+
+
+def _remember_spawns(username: str, spawns: list[dict]) -> None:
+    recent = _recent_spawns.pop(username, None) or OrderedDict()
+    for spawn in spawns:
+        recent[spawn["id"]] = spawn
+    while len(recent) > RECENT_SPAWNS_PER_PLAYER:
+        recent.popitem(last=False)
+    _recent_spawns[username] = recent
+    while len(_recent_spawns) > MAX_SPAWN_PLAYERS:
+        _recent_spawns.popitem(last=False)
+
+
+def _timeline_for(username: str) -> tuple[int, float]:
+    timeline = _timelines.get(username)
+    if timeline is None:
+        timeline = (random.getrandbits(64), time.time())
+        _timelines[username] = timeline
+        while len(_timelines) > MAX_SPAWN_TIMELINES:
+            evicted, _ = _timelines.popitem(last=False)
+            _timeline_catches.pop(evicted, None)
+    _timelines.move_to_end(username)
+    return timeline
+
+
+def _wave_at(epoch: float, timestamp: float) -> int:
+    return int((timestamp - epoch) // SPAWN_WAVE_SECONDS)
+
+
+def _catch_timeline_spawn(username: str, spawn_id: str) -> Optional[dict]:
+    """Claim a spawn that is (or just was) in the player's lake, at most once"""
+    seed, epoch = _timelines[username]
+    current = _wave_at(epoch, time.time())
+    caught = _timeline_catches.setdefault(username, set())
+    # Waves before the previous one can't be caught any more
+    caught -= {key for key in caught if key[0] != seed or key[1] < current - 1}
+    # The previous wave too: the click may have raced a wave change
+    for wave in (current, current - 1):
+        for spawn in spawn_wave(seed, wave):
+            if spawn["id"] == spawn_id:
+                key = (seed, wave, spawn_id)
+                if key in caught:
+                    return None
+                caught.add(key)
+                return spawn
+    return None
+
+
+def _catch_spawn(username: str, spawn_id: str) -> Optional[dict]:
+    """Claim a spawn from the player's timeline or their last /fishing/spawn batches"""
+    if username in _timelines:
+        spawn = _catch_timeline_spawn(username, spawn_id)
+        if spawn is not None:
+            return spawn
+    recent = _recent_spawns.get(username)
+    return recent.pop(spawn_id, None) if recent is not None else None
+
+
+@router.get("/fishing/timeline")
+async def get_spawn_timeline(
+    seconds: int = Query(SPAWN_TIMELINE_SECONDS, ge=SPAWN_WAVE_SECONDS, le=600),
+    username: str = Depends(get_current_username)
+):
+    """
+    Get the fish silhouettes for the next few waves in one go.
+    Each wave lasts waveSeconds; spawns carry the time their wave appears.
+    """
+    seed, epoch = _timeline_for(username)
+    now = time.time()
+    first = _wave_at(epoch, now)
+    last = _wave_at(epoch, now + seconds)
+    
+    spawns = []
+    for wave in range(first, last + 1):
+        appear_at = datetime.fromtimestamp(epoch + wave * SPAWN_WAVE_SECONDS, timezone.utc)
+        for spawn in spawn_wave(seed, wave):
+            spawns.append({**spawn, "wave": wave, "appearAt": appear_at})
     
-    return {"spawns": spawns}
+    return fast_json({
+        "serverTime": datetime.fromtimestamp(now, timezone.utc),
+        "waveSeconds": SPAWN_WAVE_SECONDS,
+        "until": datetime.fromtimestamp(epoch + (last + 1) * SPAWN_WAVE_SECONDS, timezone.utc),
+        "spawns": spawns,
+    })
 
 
 @router.post("/fishing/catch/{spawn_id}")
 async def attempt_catch(
     spawn_id: str, 
-    species: str = None,
-    size: str = None,
-    rarity: str = None,
+    species: Optional[str] = None,
+    size: Optional[FishSize] = None,
+    rarity: Optional[Rarity] = None,
     username: str = Depends(get_current_username)
 ):
     """
     Attempt to catch a fish silhouette.
-    Species, size, and rarity can be passed from the spawn data.
+    The spawn must be one the server handed this player (timeline or
+    /fishing/spawn). Species, size, and rarity are still accepted from older
+    clients but ignored: the server's copy of the spawn is used.
     Returns what was caught (fish, junk, or rare cosmetic).
     """
+    # Each spawn can be caught once, and only by the player it was shown to
+    spawn = _catch_spawn(username, spawn_id)
+    if spawn is None:
+        raise HTTPException(status_code=404, detail="That fish already swam away")
+    
     user = await get_user(username)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Determine what was caught
-    roll = random.random()
+    outcome = CATCH_OUTCOME_TABLE.sample()
     
-    if roll < CATCH_COSMETIC_CHANCE:
+    if outcome == "cosmetic":
         # Rare cosmetic catch!
         owned = user.get("ownedAccessories", [])
         available = [c for c in CATCHABLE_COSMETICS if c not in owned]
@@ -108,7 +198,7 @@ async def attempt_catch(
             # Add to owned accessories
             user["ownedAccessories"] = owned + [cosmetic_id]
             user["updatedAt"] = now_utc()
-            await save_user(user)
+            await save_user(user, ("ownedAccessories",))
             
             return {
                 "success": True,
@@ -122,7 +212,7 @@ async def attempt_catch(
             current_coins = user.get("gameState", {}).get("coins", 0)
             user["gameState"]["coins"] = current_coins + bonus_coins
             user["updatedAt"] = now_utc()
-            await save_user(user)
+            await save_user(user, ("gameState",))
             return {
                 "success": True,
                 "resultType": "bonus_coins",
@@ -130,7 +220,7 @@ async def attempt_catch(
                 "message": f"✨ You found a treasure! +{bonus_coins} coins"
             }
     
-    elif roll < CATCH_COSMETIC_CHANCE + CATCH_JUNK_CHANCE:
+    elif outcome == "junk":
         # Caught junk
         junk = random.choice(JUNK_ITEMS)
         return {
@@ -142,10 +232,9 @@ async def attempt_catch(
     
     else:
         # Caught a fish!
-        # Use passed values from spawn, or generate random if not provided
-        fish_rarity = rarity if rarity else weighted_rarity_choice()
-        fish_species = species if species else random.choice(FISH_SPECIES)
-        fish_size = size if size else random.choice(["sm", "md", "lg"])
+        fish_rarity = spawn["rarity"]
+        fish_species = spawn["species"]
+        fish_size = spawn["size"]
         
         # Create the caught fish (not added to tank yet)
         caught_fish = {
@@ -159,9 +248,9 @@ async def attempt_catch(
             "createdAt": now_utc()
         }
         
-        # Store caught fish temporarily in session/cache
-        # For simplicity, we'll include it in the response
-        # The frontend will call /fishing/keep or /fishing/release
+        # Held until the frontend calls /fishing/keep, /release or /swap
+        # with the fish id
+        pending_catches.put(username, caught_fish["id"], caught_fish)
         
         game_state = user.get("gameState", {})
         current_fish_count = len(user.get("fish", []))
@@ -181,8 +270,15 @@ async def attempt_catch(
         }
 
 
+def _take_pending(username: str, catch_id: str) -> dict:
+    fish = pending_catches.take(username, catch_id)
+    if fish is None:
+        raise HTTPException(status_code=404, detail="Caught fish not found (it may have swum off)")
+    return {**fish, "createdAt": now_utc()}
+
+
 @router.post("/fishing/keep")
-async def keep_fish(fish_data: dict, username: str = Depends(get_current_username)):
+async def keep_fish(request: KeepFishRequest, username: str = Depends(get_current_username)):
     """Add a caught fish to the tank"""
     user = await get_user(username)
     if not user:
@@ -192,48 +288,42 @@ async def keep_fish(fish_data: dict, username: str = Depends(get_current_usernam
     current_fish = user.get("fish", [])
     max_fish = game_state.get("maxFish", 10)
     
+    # Checked before taking the catch so a full tank can still swap or release it
     if len(current_fish) >= max_fish:
         raise HTTPException(status_code=400, detail="Tank is full!")
     
-    # Add the fish
-    new_fish = {
-        "id": fish_data.get("id", str(uuid.uuid4())),
-        "species": fish_data["species"],
-        "name": fish_data["name"],
-        "color": fish_data["color"],
-        "size": fish_data["size"],
-        "rarity": fish_data.get("rarity", "common"),
-        "accessories": fish_data.get("accessories", {"hat": None, "glasses": None, "effect": None}),
-        "createdAt": now_utc()
-    }
+    new_fish = _take_pending(username, request.fishId)
     
+    # Poop accrual depends on the fish count, so settle the tank first
+    now = now_utc()
+    materialize(user, now)
     user["fish"] = current_fish + [new_fish]
-    user["updatedAt"] = now_utc()
-    await save_user(user)
+    user["updatedAt"] = now
+    await save_user(user, ("fish", "tank", "gameState"), fish_ids=(new_fish["id"],))
     
     return {
         "success": True,
-        "fish": new_fish,
+        "fish": fish_to_response(new_fish),
         "message": f"{new_fish['name']} joined your tank!"
     }
 
 
 @router.post("/fishing/release")
-async def release_for_coins(fish_data: dict, username: str = Depends(get_current_username)):
+async def release_for_coins(request: KeepFishRequest, username: str = Depends(get_current_username)):
     """Release a caught fish for coins"""
     user = await get_user(username)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    rarity = fish_data.get("rarity", "common")
-    coins_earned = RARITY_COIN_VALUES.get(rarity, 5)
+    released = _take_pending(username, request.fishId)
+    coins_earned = RARITY_COIN_VALUES.get(released["rarity"], 5)
     
     current_coins = user.get("gameState", {}).get("coins", 0)
     new_coins = current_coins + coins_earned
     
     user["gameState"]["coins"] = new_coins
     user["updatedAt"] = now_utc()
-    await save_user(user)
+    await save_user(user, ("gameState",))
     
     return {
         "success": True,
@@ -244,17 +334,14 @@ async def release_for_coins(fish_data: dict, username: str = Depends(get_current
 
 
 @router.post("/fishing/swap")
-async def swap_fish(
-    caught_fish: dict,
-    release_fish_id: str = Query(..., description="ID of fish to release from tank"),
-    username: str = Depends(get_current_username)
-):
+async def swap_fish(request: SwapFishRequest, username: str = Depends(get_current_username)):
     """Swap a caught fish with one in the tank"""
     user = await get_user(username)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     current_fish = user.get("fish", [])
+    release_fish_id = request.releaseFishId
     
     # Find and get coins for the released fish
     released_fish = None
@@ -275,27 +362,19 @@ async def swap_fish(
     new_coins = current_coins + coins_earned
     
     # Add the new fish
-    new_fish = {
-        "id": caught_fish.get("id", str(uuid.uuid4())),
-        "species": caught_fish["species"],
-        "name": caught_fish["name"],
-        "color": caught_fish["color"],
-        "size": caught_fish["size"],
-        "rarity": caught_fish.get("rarity", "common"),
-        "accessories": {"hat": None, "glasses": None, "effect": None},
-        "createdAt": now_utc()
-    }
+    new_fish = _take_pending(username, request.caughtFishId)
     remaining_fish.append(new_fish)
     
     user["fish"] = remaining_fish
     user["gameState"]["coins"] = new_coins
     user["updatedAt"] = now_utc()
-    await save_user(user)
+    await save_user(user, ("fish", "gameState"), fish_ids=(release_fish_id, new_fish["id"]))
+    forget_fish(username, release_fish_id)
     
     return {
         "success": True,
-        "addedFish": new_fish,
-        "releasedFish": released_fish,
+        "addedFish": fish_to_response(new_fish),
+        "releasedFish": fish_to_response(released_fish),
         "coinsEarned": coins_earned,
         "newCoins": new_coins,
         "message": f"Swapped {released_fish['name']} for {new_fish['name']}! +{coins_earned} coins"
@@ -3,56 +3,38 @@ Game Router - Core game state management
 Handles tank view, feeding, cleaning, and game tick updates
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from app.auth import get_current_username
-from app.database import get_user, save_user
+from app.database import get_user, get_user_version, save_user
+from app.http_cache import cache_headers, etag_matches, not_modified
+from app.fish_fragments import fish_fragments, fish_to_response, forget_fish, touch_fish
+from app.request_timing import phase
+from app.responses import dumps, fast_json, raw_json
 from app.models import (
-    GameStateResponse, FeedResponse, CleanResponse,
+    GameStateResponse, TickResponse, FeedResponse, CleanResponse,
     FishResponse, FishCreate, FishAccessories,
-    ApplyAccessoryRequest, RenameFishRequest, now_utc, calculate_happiness
+    ApplyAccessoryRequest, RenameFishRequest, GameActionsRequest, GameActionsResponse,
+    now_utc, calculate_happiness
 )
 from app.game_config import (
-    HUNGER_DECAY_PER_MINUTE, HUNGER_FEED_RESTORE, FEED_COST,
-    POOP_GENERATION_INTERVAL, POOP_CLEANLINESS_PENALTY,
+    HUNGER_FEED_RESTORE, FEED_COST,
     SHOP_ITEMS,
     STARTING_COINS, STARTING_HUNGER, STARTING_CLEANLINESS,
-    STARTING_MAX_FISH
+    STARTING_MAX_FISH, GAME_STATE_FRESHNESS_SECONDS
 )
-from datetime import datetime, timezone
+from app.simulation import cleanliness_for, derive_tank, materialize, needs_rebase
+from app.sync_log import sync_log
+from app.tank_stream import open_tank_stream
+from app.tick_engine import read_tank, tick_engine_enabled
+from typing import Optional
+import copy
+import hashlib
+import time
 import uuid
-import random
-
-
-def ensure_tz_aware(dt):
-    """Ensure datetime is timezone-aware (UTC)"""
-    if dt is None:
-        return now_utc()
-    if isinstance(dt, str):
-        # Parse ISO format string
-        dt = datetime.fromisoformat(dt.replace("Z", "+00:00"))
-    if dt.tzinfo is None:
-        # Naive datetime - assume it's UTC
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt
 
 router = APIRouter()
 
 
-def fish_to_response(fish: dict) -> dict:
-    """Convert fish dict to response format"""
-    accessories = fish.get("accessories", {"hat": None, "glasses": None, "effect": None})
-    return {
-        "id": fish["id"],
-        "species": fish["species"],
-        "name": fish["name"],
-        "color": fish["color"],
-        "size": fish["size"],
-        "rarity": fish.get("rarity", "common"),
-        "accessories": accessories,
-        "createdAt": fish["createdAt"]
-    }
-
-
 async def get_or_create_user_game(username: str) -> dict:
     """Get user with game state, migrating from legacy if needed"""
     user = await get_user(username)
@@ -110,123 +92,147 @@ async def migrate_user_to_game(legacy_user: dict) -> dict:
     return migrated
 
 
-@router.get("/game", response_model=GameStateResponse)
-async def get_game_state(username: str = Depends(get_current_username)):
-    """Get full game state for the authenticated user"""
-    user = await get_or_create_user_game(username)
-    
-    tank = user.get("tank", {})
-    hunger = tank.get("hunger", 100)
-    
-    # Always recalculate cleanliness based on actual poop count for consistency
-    poop_positions = tank.get("poopPositions", [])
-    poop_penalty = len(poop_positions) * POOP_CLEANLINESS_PENALTY
-    cleanliness = max(0, 100 - poop_penalty)
-    
-    # Update tank with recalculated cleanliness
-    tank["cleanliness"] = cleanliness
-    
+def _state_snapshot(user: dict) -> dict:
+    """Everything in GET /game except the fish"""
+    tank = derive_tank(user, now_utc())
+    game_state = user["gameState"]
     return {
-        "gameState": user["gameState"],
-        "tank": tank,
-        "fish": [fish_to_response(f) for f in user.get("fish", [])],
+        "gameState": {
+            "coins": game_state.get("coins", STARTING_COINS),
+            "maxFish": game_state.get("maxFish", STARTING_MAX_FISH),
+            "lastActiveAt": game_state.get("lastActiveAt"),
+        },
+        "tank": {
+            "hunger": tank["hunger"],
+            "cleanliness": tank["cleanliness"],
+            "poopPositions": tank["poopPositions"],
+            "lastPoopTime": tank["lastPoopTime"],
+        },
         "ownedAccessories": user.get("ownedAccessories", []),
-        "happiness": calculate_happiness(hunger, cleanliness)
+        "happiness": calculate_happiness(tank["hunger"], tank["cleanliness"])
     }
 
 
-@router.post("/game/tick")
-async def game_tick(username: str = Depends(get_current_username)):
+def game_snapshot(user: dict) -> dict:
+    """Full game state as returned by GET /game, shaped like GameStateResponse"""
+    return {
+        **_state_snapshot(user),
+        "fish": [fish_to_response(f) for f in user.get("fish", [])],
+    }
+
+
+def game_state_body(user: dict) -> bytes:
+    """GET /game body, with each fish spliced in from its cached fragment"""
+    with phase("serialize"):
+        fish = fish_fragments.fish_array(user["username"], user.get("fish", []))
+        return dumps(_state_snapshot(user))[:-1] + b',"fish":' + fish + b"}"
+
+
+def game_state_etag(username: str, version: int) -> str:
+    # Weak: derived hunger and poop drift within a window without a new version.
+    # Versions are per-user counters, so the user is part of the tag.
+    window = int(time.time() // GAME_STATE_FRESHNESS_SECONDS)
+    user_tag = hashlib.sha1(username.encode()).hexdigest()[:12]
+    return f'W/"{user_tag}-{version}-{window}"'
+
+
+@router.get("/game", response_model=GameStateResponse)
+async def get_game_state(request: Request, username: str = Depends(get_current_username)):
+    """Get full game state for the authenticated user"""
+    # Checked before loading the user: an unchanged version needs no decoding
+    version = await get_user_version(username)
+    if version is not None:
+        etag = game_state_etag(username, version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+    
+    user = await get_or_create_user_game(username)
+    etag = game_state_etag(username, user.get("version", 0))
+    return raw_json(game_state_body(user), GameStateResponse, headers=cache_headers(etag))
+
+
+@router.get("/game/sync")
+async def sync_game_state(
+    since: Optional[int] = None,
+    username: str = Depends(get_current_username)
+):
     """
-    Update game state based on time passed.
-    Called periodically by the frontend during active play.
-    Updates: hunger decay, poop generation
+    Get only what changed since the cursor of an earlier sync.
+    Without a cursor, or when it is too old, returns a full snapshot
+    (same fields as GET /game) with "full": true.
     """
     user = await get_or_create_user_game(username)
+    return fast_json(sync_log.sync(username, since, game_snapshot(user)))
+
+
+async def tick_state(user: dict) -> dict:
+    """
+    Current meters, shaped like TickResponse.
+    Hunger decay and poop are derived from the stored anchors (see
+    app/simulation.py), so this rarely writes anything, and never does
+    when the batch tick engine (app/tick_engine.py) is running.
+    """
     now = now_utc()
     
-    game_state = user["gameState"]
-    tank = user["tank"]
-    fish = user.get("fish", [])
-    
-    last_active = ensure_tz_aware(game_state.get("lastActiveAt"))
-    
-    # Calculate time delta (cap at 5 minutes to prevent abuse)
-    seconds_passed = min((now - last_active).total_seconds(), 300)
-    minutes_passed = seconds_passed / 60
-    
-    # --- Hunger Decay ---
-    hunger = tank.get("hunger", 100)
-    hunger_loss = HUNGER_DECAY_PER_MINUTE * minutes_passed
-    new_hunger = max(0, hunger - hunger_loss)
-    
-    # --- Poop Generation ---
-    poop_positions = tank.get("poopPositions", [])
-    last_poop = ensure_tz_aware(tank.get("lastPoopTime"))
-    
-    poop_seconds = (now - last_poop).total_seconds()
-    
-    # Generate poop based on fish count and time
-    if len(fish) > 0 and poop_seconds >= POOP_GENERATION_INTERVAL:
-        # Each fish has a chance to generate poop
-        poops_to_add = int(poop_seconds / POOP_GENERATION_INTERVAL)
-        for _ in range(min(poops_to_add, len(fish))):
-            # Random fish poops at random position
-            new_poop = {
-                "id": str(uuid.uuid4()),
-                "x": random.uniform(0.1, 0.9),
-                "y": random.uniform(0.6, 0.9),  # Poop tends to sink
-                "createdAt": now
-            }
-            poop_positions.append(new_poop)
-        last_poop = now
-    
-    # --- Cleanliness based on poop count ---
-    poop_penalty = len(poop_positions) * POOP_CLEANLINESS_PENALTY
-    new_cleanliness = max(0, 100 - poop_penalty)
-    
-    # --- Happiness ---
-    happiness = calculate_happiness(new_hunger, new_cleanliness)
-    
-    user["gameState"]["lastActiveAt"] = now
-    user["tank"]["hunger"] = new_hunger
-    user["tank"]["cleanliness"] = new_cleanliness
-    user["tank"]["poopPositions"] = poop_positions
-    user["tank"]["lastPoopTime"] = last_poop
-    user["updatedAt"] = now
-    await save_user(user)
+    if not tick_engine_enabled() and needs_rebase(user, now):
+        tank = materialize(user, now)
+        user["updatedAt"] = now
+        await save_user(user, ("gameState", "tank"))
+    else:
+        # With the batch tick engine running, it does the rebasing
+        tank = read_tank(user, now)
     
+    game_state = user["gameState"]
     return {
-        "hunger": new_hunger,
-        "cleanliness": new_cleanliness,
-        "happiness": happiness,
+        "hunger": tank["hunger"],
+        "cleanliness": tank["cleanliness"],
+        "happiness": calculate_happiness(tank["hunger"], tank["cleanliness"]),
         "coins": game_state.get("coins", 0),
         "maxFish": game_state.get("maxFish", STARTING_MAX_FISH),
-        "poopCount": len(poop_positions),
-        "poopPositions": poop_positions,
+        "poopCount": len(tank["poopPositions"]),
+        "poopPositions": tank["poopPositions"],
     }
 
 
-@router.post("/game/feed", response_model=FeedResponse)
-async def feed_tank(username: str = Depends(get_current_username)):
-    """Feed all fish in the tank"""
+@router.post("/game/tick", response_model=TickResponse)
+async def game_tick(username: str = Depends(get_current_username)):
+    """
+    Report game state based on time passed.
+    Called periodically by the frontend during active play.
+    """
     user = await get_or_create_user_game(username)
+    return fast_json(await tick_state(user), TickResponse)
+
+
+@router.get("/game/stream")
+async def stream_game_state(username: str = Depends(get_current_username)):
+    """
+    Server-sent "tank" events (same body as POST /game/tick) whenever the
+    visible meters or poop change; replaces tick polling while open.
+    """
+    await get_or_create_user_game(username)
     
+    async def load_state() -> dict:
+        # Reloaded each time: the cache hands back the current user dict
+        return await tick_state(await get_or_create_user_game(username))
+    
+    return open_tank_stream(load_state)
+
+
+def _feed(user: dict, now) -> dict:
     game_state = user["gameState"]
-    tank = user["tank"]
     coins = game_state.get("coins", 0)
     
     if coins < FEED_COST:
         raise HTTPException(status_code=400, detail="Not enough coins to feed")
     
-    hunger = tank.get("hunger", 0)
-    new_hunger = min(100, hunger + HUNGER_FEED_RESTORE)
+    tank = materialize(user, now)
+    new_hunger = min(100, tank["hunger"] + HUNGER_FEED_RESTORE)
     new_coins = coins - FEED_COST
     
     user["tank"]["hunger"] = new_hunger
     user["gameState"]["coins"] = new_coins
-    user["updatedAt"] = now_utc()
-    await save_user(user)
+    user["updatedAt"] = now
     
     return {
         "success": True,
@@ -236,18 +242,28 @@ async def feed_tank(username: str = Depends(get_current_username)):
     }
 
 
+@router.post("/game/feed", response_model=FeedResponse)
+async def feed_tank(username: str = Depends(get_current_username)):
+    """Feed all fish in the tank"""
+    user = await get_or_create_user_game(username)
+    result = _feed(user, now_utc())
+    await save_user(user, ("tank", "gameState"))
+    return result
+
+
 @router.post("/game/clean", response_model=CleanResponse)
 async def clean_tank(username: str = Depends(get_current_username)):
     """Clean all poop from the tank"""
     user = await get_or_create_user_game(username)
-    tank = user["tank"]
+    now = now_utc()
+    tank = materialize(user, now)
     
-    poop_count = len(tank.get("poopPositions", []))
+    poop_count = len(tank["poopPositions"])
     
     user["tank"]["poopPositions"] = []
     user["tank"]["cleanliness"] = 100.0
-    user["updatedAt"] = now_utc()
-    await save_user(user)
+    user["updatedAt"] = now
+    await save_user(user, ("tank", "gameState"))
     
     return {
         "success": True,
@@ -256,22 +272,19 @@ async def clean_tank(username: str = Depends(get_current_username)):
     }
 
 
-@router.delete("/game/poop/{poop_id}")
-async def clean_single_poop(poop_id: str, username: str = Depends(get_current_username)):
-    """Remove a single poop by clicking on it"""
-    user = await get_or_create_user_game(username)
-    tank = user["tank"]
+def _remove_poop(user: dict, now, poop_id: str) -> dict:
+    # Derive first: the clicked poop may not have been stored yet
+    current = derive_tank(user, now)["poopPositions"]
+    poop_positions = [p for p in current if p["id"] != poop_id]
     
-    poop_positions = [p for p in tank.get("poopPositions", []) if p["id"] != poop_id]
-    poop_penalty = len(poop_positions) * POOP_CLEANLINESS_PENALTY
-    new_cleanliness = max(0, 100 - poop_penalty)
-    
-    if len(poop_positions) == len(tank.get("poopPositions", [])):
+    if len(poop_positions) == len(current):
         raise HTTPException(status_code=404, detail="Poop not found")
+    
+    materialize(user, now)
+    new_cleanliness = cleanliness_for(len(poop_positions))
     user["tank"]["poopPositions"] = poop_positions
     user["tank"]["cleanliness"] = new_cleanliness
-    user["updatedAt"] = now_utc()
-    await save_user(user)
+    user["updatedAt"] = now
     
     return {
         "success": True,
@@ -280,6 +293,15 @@ async def clean_single_poop(poop_id: str, username: str = Depends(get_current_us
     }
 
 
+@router.delete("/game/poop/{poop_id}")
+async def clean_single_poop(poop_id: str, username: str = Depends(get_current_username)):
+    """Remove a single poop by clicking on it"""
+    user = await get_or_create_user_game(username)
+    result = _remove_poop(user, now_utc(), poop_id)
+    await save_user(user, ("tank", "gameState"))
+    return result
+
+
 @router.post("/game/coins")
 async def add_coins(amount: int, username: str = Depends(get_current_username)):
     """Add coins to the user's balance (e.g., from collecting coins in the lake)"""
@@ -289,7 +311,7 @@ async def add_coins(amount: int, username: str = Depends(get_current_username)):
     
     user["gameState"]["coins"] = new_coins
     user["updatedAt"] = now_utc()
-    await save_user(user)
+    await save_user(user, ("gameState",))
     
     return {
         "success": True,
@@ -320,60 +342,66 @@ async def add_fish(fish_data: FishCreate, username: str = Depends(get_current_us
         "createdAt": now_utc()
     }
     
+    # Poop accrual depends on the fish count, so settle the tank first
+    now = now_utc()
+    materialize(user, now)
     user["fish"] = user.get("fish", []) + [new_fish]
-    user["updatedAt"] = now_utc()
-    await save_user(user)
+    user["updatedAt"] = now
+    await save_user(user, ("fish", "tank", "gameState"), fish_ids=(new_fish["id"],))
     
     return fish_to_response(new_fish)
 
 
-@router.delete("/fish/{fish_id}")
-async def release_fish(fish_id: str, username: str = Depends(get_current_username)):
-    """Release a fish from the tank"""
-    user = await get_or_create_user_game(username)
+def _release_fish(user: dict, now, fish_id: str) -> dict:
     fish = user.get("fish", [])
     updated_fish = [f for f in fish if f["id"] != fish_id]
     
     if len(updated_fish) == len(fish):
         raise HTTPException(status_code=404, detail="Fish not found")
     
+    materialize(user, now)
     user["fish"] = updated_fish
-    user["updatedAt"] = now_utc()
-    await save_user(user)
+    user["updatedAt"] = now
     
     return {"success": True, "fishId": fish_id}
 
 
-@router.patch("/fish/{fish_id}/name", response_model=FishResponse)
-async def rename_fish(
-    fish_id: str,
-    request: RenameFishRequest,
-    username: str = Depends(get_current_username)
-):
-    """Rename a fish in the tank"""
+@router.delete("/fish/{fish_id}")
+async def release_fish(fish_id: str, username: str = Depends(get_current_username)):
+    """Release a fish from the tank"""
     user = await get_or_create_user_game(username)
-    fish_list = user.get("fish", [])
-    
-    for fish in fish_list:
+    result = _release_fish(user, now_utc(), fish_id)
+    await save_user(user, ("fish", "tank", "gameState"), fish_ids=(fish_id,))
+    forget_fish(username, fish_id)
+    return result
+
+
+def _rename_fish(user: dict, now, fish_id: str, name: str) -> dict:
+    for fish in user.get("fish", []):
         if fish["id"] == fish_id:
-            fish["name"] = request.name
-            user["fish"] = fish_list
-            user["updatedAt"] = now_utc()
-            await save_user(user)
+            fish["name"] = name
+            touch_fish(fish)
+            user["updatedAt"] = now
             return fish_to_response(fish)
     
     raise HTTPException(status_code=404, detail="Fish not found")
 
 
-@router.post("/fish/{fish_id}/accessory")
-async def apply_accessory(
+@router.patch("/fish/{fish_id}/name", response_model=FishResponse)
+async def rename_fish(
     fish_id: str,
-    request: ApplyAccessoryRequest,
+    request: RenameFishRequest,
     username: str = Depends(get_current_username)
 ):
-    """Apply an accessory to a fish"""
+    """Rename a fish in the tank"""
     user = await get_or_create_user_game(username)
-    
+    result = _rename_fish(user, now_utc(), fish_id, request.name)
+    await save_user(user, ("fish",), fish_ids=(fish_id,))
+    forget_fish(username, fish_id)
+    return result
+
+
+def _apply_accessory(user: dict, now, fish_id: str, request: ApplyAccessoryRequest) -> dict:
     # Validate slot
     if request.slot not in ["hat", "glasses", "effect"]:
         raise HTTPException(status_code=400, detail="Invalid accessory slot")
@@ -399,13 +427,81 @@ async def apply_accessory(
             accessories = fish.get("accessories", {"hat": None, "glasses": None, "effect": None})
             accessories[request.slot] = request.itemId
             fish["accessories"] = accessories
+            touch_fish(fish)
             break
     
     if not fish_found:
         raise HTTPException(status_code=404, detail="Fish not found")
     
     user["fish"] = fish_list
-    user["updatedAt"] = now_utc()
-    await save_user(user)
+    user["updatedAt"] = now
     
     return {"success": True, "fishId": fish_id, "slot": request.slot, "itemId": request.itemId}
+
+
+@router.post("/fish/{fish_id}/accessory")
+async def apply_accessory(
+    fish_id: str,
+    request: ApplyAccessoryRequest,
+    username: str = Depends(get_current_username)
+):
+    """Apply an accessory to a fish"""
+    user = await get_or_create_user_game(username)
+    result = _apply_accessory(user, now_utc(), fish_id, request)
+    await save_user(user, ("fish",), fish_ids=(fish_id,))
+    forget_fish(username, fish_id)
+    return result
+
+
+# Each batched action: (apply it, sections it changes, whether it changes a fish)
+_ACTIONS = {
+    "removePoop": (lambda user, now, action: _remove_poop(user, now, action.poopId),
+                   ("tank", "gameState"), False),
+    "feed": (lambda user, now, action: _feed(user, now),
+             ("tank", "gameState"), False),
+    "renameFish": (lambda user, now, action: _rename_fish(user, now, action.fishId, action.name),
+                   ("fish",), True),
+    "applyAccessory": (lambda user, now, action: _apply_accessory(user, now, action.fishId, action),
+                       ("fish",), True),
+    "releaseFish": (lambda user, now, action: _release_fish(user, now, action.fishId),
+                    ("fish", "tank", "gameState"), True),
+}
+
+
+@router.post("/game/actions", response_model=GameActionsResponse)
+async def apply_actions(request: GameActionsRequest, username: str = Depends(get_current_username)):
+    """
+    Apply several actions (remove poop, feed, rename, dress up, release) in
+    order with one save. If any action fails, none of them are applied and
+    the error names the failing action.
+    """
+    user = await get_or_create_user_game(username)
+    # Work on a copy so a failing action leaves the stored user untouched
+    working = copy.deepcopy(user)
+    now = now_utc()
+    results = []
+    sections = set()
+    fish_ids = set()
+    
+    for index, action in enumerate(request.actions):
+        apply, changed, fish_changed = _ACTIONS[action.type]
+        try:
+            results.append(apply(working, now, action))
+        except HTTPException as exc:
+            raise HTTPException(
+                status_code=exc.status_code,
+                detail=f"Action {index} ({action.type}) failed: {exc.detail}"
+            )
+        sections.update(changed)
+        if fish_changed:
+            fish_ids.add(action.fishId)
+    
+    # Copy back rather than swap dicts: the cache and tick engine hold this one
+    user.clear()
+    user.update(working)
+    await save_user(user, sections, fish_ids=fish_ids)
+    # Only now that the batch is saved do its fish fragments go stale
+    for fish_id in fish_ids:
+        forget_fish(username, fish_id)
+    
+    return {"success": True, "results": results}
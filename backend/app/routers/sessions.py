@@ -1,14 +1,21 @@
 from fastapi import APIRouter, Response, Depends, HTTPException, Request
-from app.models import SessionCreate, SessionResponse, now_utc, hash_password, verify_password
+from app.models import SessionCreate, SessionResponse, now_utc
+from app.passwords import hash_password_async, verify_password_async
 from app.auth import set_session_cookie, clear_session_cookie, get_current_username
 from app.database import get_user, save_user
 from app.game_config import STARTING_COINS, STARTING_HUNGER, STARTING_CLEANLINESS, STARTING_MAX_FISH
+from app.fish_fragments import forget_fish
+from app.simulation import materialize
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+import os
 import uuid
 
+# Off only for local load tests, where every simulated player shares one IP
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+
 router = APIRouter()
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=get_remote_address, enabled=RATE_LIMIT_ENABLED)
 
 
 @router.post("/sessions", response_model=SessionResponse)
@@ -29,14 +36,14 @@ async def create_session(request: Request, session_data: SessionCreate, response
         # Check if this is a legacy user (created before passwords were added)
         if "password_hash" not in user:
             # Migrate legacy user: set their password
-            user["password_hash"] = hash_password(password)
+            user["password_hash"] = await hash_password_async(password)
             user["updatedAt"] = now_utc()
-            await save_user(user)
+            await save_user(user, ("password_hash",))
             set_session_cookie(response, username)
             return SessionResponse(username=username, is_new_user=False)
         
         # User exists with password - verify it
-        if not verify_password(password, user["password_hash"]):
+        if not await verify_password_async(password, user["password_hash"]):
             raise HTTPException(status_code=401, detail="Incorrect password")
         
         # Password correct - login
@@ -47,7 +54,7 @@ async def create_session(request: Request, session_data: SessionCreate, response
     
     new_user = {
         "username": username,
-        "password_hash": hash_password(password),
+        "password_hash": await hash_password_async(password),
         "gameState": {
             "coins": STARTING_COINS,
             "maxFish": STARTING_MAX_FISH,
@@ -124,6 +131,9 @@ async def migrate_local_game_state(
                 fish_copy["id"] = str(uuid.uuid4())
             if "createdAt" not in fish_copy:
                 fish_copy["createdAt"] = now_utc()
+            # Revisions are server-side; the id may still name a cached fragment
+            fish_copy.pop("revision", None)
+            forget_fish(username, fish_copy["id"])
             fish_to_add.append(fish_copy)
         else:
             # Tank full - convert to coins
@@ -138,11 +148,19 @@ async def migrate_local_game_state(
     # Merge accessories (union of both sets)
     merged_accessories = list(set(current_accessories + local_accessories))
     
+    # Poop accrual depends on the fish count, so settle the tank first
+    now = now_utc()
+    if "tank" in user:
+        materialize(user, now)
     user["fish"] = current_fish + fish_to_add
-    user["gameState"] = {**current_game_state, "coins": new_coins}
+    user["gameState"] = {**user.get("gameState", {}), "coins": new_coins}
     user["ownedAccessories"] = merged_accessories
-    user["updatedAt"] = now_utc()
-    await save_user(user)
+    user["updatedAt"] = now
+    await save_user(
+        user,
+        ("fish", "tank", "gameState", "ownedAccessories"),
+        fish_ids=[fish["id"] for fish in fish_to_add],
+    )
     
     return {
         "success": True,
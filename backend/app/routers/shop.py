@@ -2,53 +2,37 @@
 Shop Router - Cosmetics and accessories shop
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from app import shop_catalog
 from app.auth import get_current_username
 from app.database import get_user, save_user
-from app.models import ShopItem, now_utc
+from app.http_cache import cache_headers, etag_matches, not_modified
+from app.models import ShopItem, ShopItemsResponse, now_utc
 from app.game_config import SHOP_ITEMS
 
 router = APIRouter()
 
 
-@router.get("/shop/items")
-async def list_shop_items(username: str = Depends(get_current_username)):
+@router.get("/shop/items", response_model=ShopItemsResponse)
+async def list_shop_items(request: Request, username: str = Depends(get_current_username)):
     """Get all shop items with ownership status"""
     user = await get_user(username)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    game_state = user.get("gameState", {})
-    current_coins = game_state.get("coins", 0)
-    owned = set(user.get("ownedAccessories", []))
-    
-    items = []
-    for item_id, item_data in SHOP_ITEMS.items():
-        is_owned = item_id in owned
-        is_catch_only = item_data.get("catchOnly", False)
-        can_buy = (
-            not is_owned and 
-            current_coins >= item_data["price"] and
-            not is_catch_only
-        )
-        
-        items.append({
-            "id": item_id,
-            "name": item_data["name"],
-            "category": item_data["category"],
-            "price": item_data["price"],
-            "owned": is_owned,
-            "canBuy": can_buy,
-            "catchOnly": is_catch_only
-        })
-    
-    # Sort by category, then by price
-    items.sort(key=lambda x: (x["category"], x["price"], x["name"]))
-    
-    return {
-        "items": items,
-        "coins": current_coins
-    }
+    current_coins = user.get("gameState", {}).get("coins", 0)
+    catalog = shop_catalog.catalog
+    owned = catalog.ownership_mask(user.get("ownedAccessories", []))
+    
+    # Items come pre-sorted by category, then price, then name
+    etag = catalog.items_etag(owned, current_coins)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(
+        catalog.items_body(owned, current_coins),
+        media_type="application/json",
+        headers=cache_headers(etag),
+    )
 
 
 @router.post("/shop/buy/{item_id}")
@@ -87,7 +71,7 @@ async def purchase_item(item_id: str, username: str = Depends(get_current_userna
     user["gameState"]["coins"] = new_coins
     user["ownedAccessories"] = owned
     user["updatedAt"] = now_utc()
-    await save_user(user)
+    await save_user(user, ("gameState", "ownedAccessories"))
     
     return {
         "success": True,
@@ -100,26 +84,16 @@ async def purchase_item(item_id: str, username: str = Depends(get_current_userna
 
 
 @router.get("/shop/owned")
-async def get_owned_items(username: str = Depends(get_current_username)):
+async def get_owned_items(request: Request, username: str = Depends(get_current_username)):
     """Get all items owned by the user, organized by category"""
     user = await get_user(username)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    owned_ids = set(user.get("ownedAccessories", []))
-    
-    owned_items = {
-        "hat": [],
-        "glasses": [],
-        "effect": []
-    }
-    
-    for item_id in owned_ids:
-        if item_id in SHOP_ITEMS:
-            item = SHOP_ITEMS[item_id]
-            owned_items[item["category"]].append({
-                "id": item_id,
-                "name": item["name"]
-            })
+    catalog = shop_catalog.catalog
+    owned = catalog.ownership_mask(user.get("ownedAccessories", []))
     
-    return owned_items
+    etag = catalog.owned_etag(owned)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    return Response(catalog.owned_body(owned), media_type="application/json", headers=cache_headers(etag))
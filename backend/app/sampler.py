@@ -0,0 +1,135 @@
+"""
+Precomputed samplers for the fishing minigame.
+
+The weighted draws (rarity, species, size, catch outcome) use Walker alias
+tables built once from game_config, so each draw is one random number and a
+table lookup instead of re-summing the weights. Lake spawns are generated in
+batches into a buffer and handed out a few at a time, or derived wave by wave
+from a per-player seed for the spawn timeline.
+"""
+
+from __future__ import annotations
+
+import random
+import uuid
+from typing import Hashable, Iterable, Optional, Sequence
+
+from app.game_config import (
+    RARITY_WEIGHTS, RARITY_SPEED, FISH_SPECIES,
+    CATCH_COSMETIC_CHANCE, CATCH_JUNK_CHANCE,
+)
+
+
+FISH_SIZES = ("sm", "md", "lg")
+SPAWN_BUFFER_SIZE = 512
+
+
+class AliasTable:
+    """Walker's alias method: O(1) draws from a fixed discrete distribution."""
+
+    def __init__(self, outcomes: Sequence[Hashable], weights: Iterable[float]):
+        weights = [float(w) for w in weights]
+        if len(outcomes) != len(weights) or not outcomes:
+            raise ValueError("need one weight per outcome")
+        total = sum(weights)
+        if total <= 0 or min(weights) < 0:
+            raise ValueError("weights must be non-negative with a positive sum")
+
+        n = len(outcomes)
+        scaled = [w * n / total for w in weights]
+        self.outcomes = tuple(outcomes)
+        self._prob = [1.0] * n
+        self._alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left is 1.0 up to rounding error
+
+    @classmethod
+    def from_weights(cls, weights: dict) -> "AliasTable":
+        return cls(list(weights), weights.values())
+
+    @classmethod
+    def uniform(cls, outcomes: Sequence[Hashable]) -> "AliasTable":
+        return cls(outcomes, [1] * len(outcomes))
+
+    def sample(self, rng: random.Random = random) -> Hashable:
+        u = rng.random() * len(self.outcomes)
+        i = int(u)
+        return self.outcomes[i if u - i < self._prob[i] else self._alias[i]]
+
+    def sample_many(self, count: int, rng: random.Random = random) -> list:
+        n = len(self.outcomes)
+        outcomes, prob, alias = self.outcomes, self._prob, self._alias
+        draws = []
+        for _ in range(count):
+            u = rng.random() * n
+            i = int(u)
+            draws.append(outcomes[i if u - i < prob[i] else alias[i]])
+        return draws
+
+
+RARITY_TABLE = AliasTable.from_weights(RARITY_WEIGHTS)
+SPECIES_TABLE = AliasTable.uniform(FISH_SPECIES)
+SIZE_TABLE = AliasTable.uniform(FISH_SIZES)
+# Same split as the old "roll < cosmetic, < cosmetic + junk, else fish" check
+CATCH_OUTCOME_TABLE = AliasTable(
+    ("cosmetic", "junk", "fish"),
+    (CATCH_COSMETIC_CHANCE, CATCH_JUNK_CHANCE, 1 - CATCH_COSMETIC_CHANCE - CATCH_JUNK_CHANCE),
+)
+
+
+def generate_spawns(count: int, rng: random.Random = random) -> list[dict]:
+    """Build ``count`` lake spawns, drawing each field for the whole batch at once."""
+    rarities = RARITY_TABLE.sample_many(count, rng)
+    species = SPECIES_TABLE.sample_many(count, rng)
+    sizes = SIZE_TABLE.sample_many(count, rng)
+    bits = rng.getrandbits
+    uniform = rng.uniform
+    return [
+        {
+            "id": str(uuid.UUID(int=bits(128), version=4)),
+            "species": species[i],
+            "rarity": rarities[i],
+            "x": uniform(0.1, 0.9),
+            "y": uniform(0.2, 0.8),
+            "speed": RARITY_SPEED[rarities[i]],
+            "direction": -1 if bits(1) else 1,
+            "size": sizes[i],
+        }
+        for i in range(count)
+    ]
+
+
+def spawn_wave(seed: int, wave: int) -> list[dict]:
+    """The spawns of one timeline wave; the same for a given seed and wave."""
+    rng = random.Random(f"{seed}:{wave}")
+    return generate_spawns(rng.randint(3, 6), rng)
+
+
+class SpawnBuffer:
+    """Pre-generated spawns handed out in order, refilled a batch at a time."""
+
+    def __init__(self, capacity: int = SPAWN_BUFFER_SIZE, rng: Optional[random.Random] = None):
+        self.capacity = capacity
+        self._rng = rng or random.Random()
+        self._spawns: list[dict] = []
+        self._next = 0
+        self.refills = 0
+
+    def take(self, count: int) -> list[dict]:
+        if self._next + count > len(self._spawns):
+            self._spawns = generate_spawns(max(self.capacity, count), self._rng)
+            self._next = 0
+            self.refills += 1
+        taken = self._spawns[self._next:self._next + count]
+        self._next += count
+        return taken
+
+
+spawn_buffer = SpawnBuffer()
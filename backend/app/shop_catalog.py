@@ -0,0 +1,103 @@
+"""
+Precompiled shop catalog.
+
+The catalog only changes with game_config, so it is sorted and serialized
+once. Every item gets a bit in an ownership mask and four pre-encoded JSON
+variants (owned x canBuy); a shop page is then the player's mask and coins
+overlaid on those fragments. The same inputs also make the ETag.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Iterable
+
+from app.game_config import SHOP_ITEMS
+
+
+OWNED_CATEGORIES = ("hat", "glasses", "effect")
+
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class ShopCatalog:
+    def __init__(self, items: dict):
+        ordered = sorted(
+            items.items(), key=lambda kv: (kv[1]["category"], kv[1]["price"], kv[1]["name"])
+        )
+        self.ids = [item_id for item_id, _ in ordered]
+        self.bits = {item_id: 1 << index for index, item_id in enumerate(self.ids)}
+        self.prices = [item["price"] for _, item in ordered]
+        self.buyable = [not item.get("catchOnly", False) for _, item in ordered]
+        self.version = hashlib.sha1(_dumps(ordered)).hexdigest()[:12]
+
+        # _fragments[index][owned][can_buy]
+        self._fragments = []
+        for item_id, item in ordered:
+            base = {
+                "id": item_id,
+                "name": item["name"],
+                "category": item["category"],
+                "price": item["price"],
+            }
+            self._fragments.append([
+                [
+                    _dumps({**base, "owned": owned, "canBuy": can_buy,
+                            "catchOnly": item.get("catchOnly", False)})
+                    for can_buy in (False, True)
+                ]
+                for owned in (False, True)
+            ])
+
+        # Owned-items view: one pre-encoded {"id","name"} per item, by category
+        self._owned_entries = [_dumps({"id": item_id, "name": item["name"]}) for item_id, item in ordered]
+        self._categories = [item["category"] for _, item in ordered]
+
+    def ownership_mask(self, owned_ids: Iterable[str]) -> int:
+        bits = self.bits
+        mask = 0
+        for item_id in owned_ids:
+            mask |= bits.get(item_id, 0)
+        return mask
+
+    def items_etag(self, mask: int, coins: int) -> str:
+        return f'"shop-{self.version}-{mask:x}-{coins}"'
+
+    def owned_etag(self, mask: int) -> str:
+        return f'"owned-{self.version}-{mask:x}"'
+
+    def items_body(self, mask: int, coins: int) -> bytes:
+        """JSON for GET /shop/items: {"items": [...], "coins": n}"""
+        parts = []
+        for index, fragments in enumerate(self._fragments):
+            owned = bool(mask >> index & 1)
+            can_buy = not owned and self.buyable[index] and coins >= self.prices[index]
+            parts.append(fragments[owned][can_buy])
+        return b'{"items":[' + b",".join(parts) + b'],"coins":' + _dumps(coins) + b"}"
+
+    def owned_body(self, mask: int) -> bytes:
+        """JSON for GET /shop/owned: owned items grouped by category"""
+        groups = {category: [] for category in OWNED_CATEGORIES}
+        index = 0
+        while mask:
+            if mask & 1:
+                groups.setdefault(self._categories[index], []).append(self._owned_entries[index])
+            mask >>= 1
+            index += 1
+        return b"{" + b",".join(
+            _dumps(category) + b":[" + b",".join(entries) + b"]"
+            for category, entries in groups.items()
+        ) + b"}"
+
+
+catalog = ShopCatalog(SHOP_ITEMS)
+
+
+def reload_catalog(items: dict = SHOP_ITEMS) -> ShopCatalog:
+    """Rebuild the catalog after SHOP_ITEMS changes"""
+    global catalog
+    catalog = ShopCatalog(items)
+    return catalog
@@ -0,0 +1,119 @@
+"""
+Closed-form tank simulation.
+
+Hunger decay and poop accrual are pure functions of the stored anchors
+(``gameState.lastActiveAt``, ``tank.lastPoopTime``), the fish count, and the
+game_config constants. Instead of rewriting the tank on every tick, reads
+derive the current state from those anchors. Pending poop comes from a seeded
+sequence so its ids and positions are the same on every read. State is only
+folded back into storage ("materialized") when the player acts, or when the
+anchors go stale.
+"""
+
+from datetime import datetime, timedelta, timezone
+import random
+import uuid
+
+from app.game_config import (
+    HUNGER_DECAY_PER_MINUTE, POOP_GENERATION_INTERVAL, POOP_CLEANLINESS_PENALTY,
+    MAX_CATCH_UP_SECONDS, REBASE_AFTER_SECONDS,
+)
+from app.models import now_utc
+
+
+def ensure_tz_aware(dt):
+    """Ensure datetime is timezone-aware (UTC)"""
+    if dt is None:
+        return now_utc()
+    if isinstance(dt, str):
+        # Parse ISO format string
+        dt = datetime.fromisoformat(dt.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        # Naive datetime - assume it's UTC
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def cleanliness_for(poop_count: int) -> float:
+    """Cleanliness is always derived from how much poop is in the tank"""
+    return max(0, 100 - poop_count * POOP_CLEANLINESS_PENALTY)
+
+
+def _seeded_poop(username: str, last_poop: datetime, index: int) -> dict:
+    rng = random.Random(f"{username}:{last_poop.isoformat()}:{index}")
+    return {
+        "id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+        "x": rng.uniform(0.1, 0.9),
+        "y": rng.uniform(0.6, 0.9),  # Poop tends to sink
+        "createdAt": last_poop + timedelta(seconds=POOP_GENERATION_INTERVAL * (index + 1)),
+    }
+
+
+def pending_poop(username: str, last_poop: datetime, count: int) -> list[dict]:
+    """The first ``count`` poops due after ``last_poop``, stable across reads."""
+    return [_seeded_poop(username, last_poop, i) for i in range(count)]
+
+
+def _pending_poop_count(fish_count: int, last_poop: datetime, now: datetime) -> int:
+    if fish_count == 0:
+        return 0
+    poop_seconds = (now - last_poop).total_seconds()
+    # Like the old per-tick loop, at most one pending poop per fish
+    return max(0, min(int(poop_seconds // POOP_GENERATION_INTERVAL), fish_count))
+
+
+def derive_tank(user: dict, now: datetime) -> dict:
+    """Current tank state at ``now``, without modifying the user."""
+    tank = user.get("tank", {})
+    game_state = user.get("gameState", {})
+    fish_count = len(user.get("fish", []))
+
+    # Catch-up is capped so time away from the game doesn't starve the tank
+    elapsed = (now - ensure_tz_aware(game_state.get("lastActiveAt"))).total_seconds()
+    elapsed = min(max(elapsed, 0), MAX_CATCH_UP_SECONDS)
+    hunger = max(0, tank.get("hunger", 100) - HUNGER_DECAY_PER_MINUTE * elapsed / 60)
+
+    last_poop = ensure_tz_aware(tank.get("lastPoopTime"))
+    pending = _pending_poop_count(fish_count, last_poop, now)
+    poop_positions = tank.get("poopPositions", []) + pending_poop(user["username"], last_poop, pending)
+    cleanliness = cleanliness_for(len(poop_positions))
+
+    return {
+        **tank,
+        "hunger": hunger,
+        "cleanliness": cleanliness,
+        "poopPositions": poop_positions,
+        "lastPoopTime": now if pending else last_poop,
+    }
+
+
+def needs_rebase(user: dict, now: datetime) -> bool:
+    """Whether derived state must be stored before it stops being derivable.
+
+    Hunger only decays for MAX_CATCH_UP_SECONDS past the anchor, and pending
+    poop stops growing once every fish has pooped, so the anchors have to move
+    forward during continuous play. They move every REBASE_AFTER_SECONDS, well
+    before the cap, so ticks that arrive late still keep all of the decay.
+    """
+    last_active = ensure_tz_aware(user.get("gameState", {}).get("lastActiveAt"))
+    if (now - last_active).total_seconds() >= REBASE_AFTER_SECONDS:
+        return True
+    fish_count = len(user.get("fish", []))
+    last_poop = ensure_tz_aware(user.get("tank", {}).get("lastPoopTime"))
+    return fish_count > 0 and _pending_poop_count(fish_count, last_poop, now) >= fish_count
+
+
+def materialize(user: dict, now: datetime) -> dict:
+    """Fold derived state into the stored tank and move the anchors to ``now``.
+
+    Call before any action that changes the tank or the fish count; the
+    caller saves the "tank" and "gameState" sections.
+    """
+    state = derive_tank(user, now)
+    tank = user.setdefault("tank", {})
+    tank["hunger"] = state["hunger"]
+    tank["cleanliness"] = state["cleanliness"]
+    tank["poopPositions"] = state["poopPositions"]
+    tank["lastPoopTime"] = state["lastPoopTime"]
+    user.setdefault("gameState", {})["lastActiveAt"] = now
+    return state
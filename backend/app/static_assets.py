@@ -0,0 +1,155 @@
+"""
+In-memory server for the built React app.
+
+At startup every file under STATIC_DIR is indexed once. Files up to
+STATIC_INLINE_MAX_BYTES are read into memory along with gzip (and, when the
+``brotli`` package is installed, brotli) variants, so requests for them never
+touch the filesystem. Larger files are streamed with the stat result taken at
+startup. Hashed files under ``assets/`` are cached as immutable; everything
+else (index.html, favicon, ...) is revalidated with its ETag. Each encoding
+of a file has its own ETag (``-gz`` / ``-br`` suffixes), since the bodies
+differ byte for byte.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import os
+from pathlib import Path
+from typing import Optional
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+from app.http_cache import etag_matches
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+
+STATIC_DIR = os.getenv("STATIC_DIR", "/app/static")
+STATIC_INLINE_MAX_BYTES = int(os.getenv("STATIC_INLINE_MAX_BYTES", str(512 * 1024)))
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Already-compressed formats gain nothing from another pass
+_COMPRESSIBLE_TYPES = (
+    "text/", "application/javascript", "application/json", "application/xml",
+    "application/manifest+json", "image/svg+xml",
+)
+_MIN_COMPRESS_BYTES = 256
+_ETAG_SUFFIXES = {"identity": "", "gzip": "-gz", "br": "-br"}
+
+
+def _compressible(content_type: str, size: int) -> bool:
+    return size >= _MIN_COMPRESS_BYTES and content_type.startswith(_COMPRESSIBLE_TYPES)
+
+
+def _content_type(path: Path) -> str:
+    content_type, _ = mimetypes.guess_type(path.name)
+    return content_type or "application/octet-stream"
+
+
+class StaticAsset:
+    def __init__(self, path: Path, relative: str, stat: os.stat_result, inline_max: int):
+        self.path = path
+        self.content_type = _content_type(path)
+        self.cache_control = IMMUTABLE if relative.startswith("assets/") else REVALIDATE
+        self.stat = stat
+        # encoding -> body; empty for files streamed from disk
+        self.variants: dict[str, bytes] = {}
+
+        if stat.st_size <= inline_max:
+            body = path.read_bytes()
+            self.tag = hashlib.sha1(body).hexdigest()[:16]
+            self.variants["identity"] = body
+            if _compressible(self.content_type, len(body)):
+                compressed = gzip.compress(body, compresslevel=9, mtime=0)
+                if len(compressed) < len(body):
+                    self.variants["gzip"] = compressed
+                if brotli is not None:
+                    compressed = brotli.compress(body, quality=11)
+                    if len(compressed) < len(body):
+                        self.variants["br"] = compressed
+        else:
+            self.tag = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+    def etag(self, encoding: str = "identity") -> str:
+        return f'"{self.tag}{_ETAG_SUFFIXES[encoding]}"'
+
+    @property
+    def inline(self) -> bool:
+        return bool(self.variants)
+
+    def _encoding_for(self, accept_encoding: str) -> str:
+        accepted = set()
+        for part in accept_encoding.replace(" ", "").lower().split(","):
+            encoding, _, params = part.partition(";")
+            if params not in ("q=0", "q=0.0"):
+                accepted.add(encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in accepted:
+                return encoding
+        return "identity"
+
+    def response(self, request: Request) -> Response:
+        encoding = "identity"
+        if len(self.variants) > 1:
+            encoding = self._encoding_for(request.headers.get("accept-encoding", ""))
+        headers = {"ETag": self.etag(encoding), "Cache-Control": self.cache_control}
+        if len(self.variants) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if etag_matches(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        if not self.inline:
+            return FileResponse(self.path, headers=headers, stat_result=self.stat)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(self.variants[encoding], media_type=self.content_type, headers=headers)
+
+
+class AssetManifest:
+    def __init__(self, assets: Optional[dict[str, StaticAsset]] = None):
+        self.assets = assets or {}
+        self.index = self.assets.get("index.html")
+
+    @classmethod
+    def scan(cls, root: Path, inline_max: int = STATIC_INLINE_MAX_BYTES) -> "AssetManifest":
+        assets = {}
+        if root.is_dir():
+            for path in sorted(root.rglob("*")):
+                if path.is_file():
+                    relative = path.relative_to(root).as_posix()
+                    assets[relative] = StaticAsset(path, relative, path.stat(), inline_max)
+        return cls(assets)
+
+    def get(self, relative: str) -> Optional[StaticAsset]:
+        return self.assets.get(relative)
+
+    def stats(self) -> dict:
+        inline = [asset for asset in self.assets.values() if asset.inline]
+        return {
+            "files": len(self.assets),
+            "inline": len(inline),
+            "inlineBytes": sum(
+                sum(len(body) for body in asset.variants.values()) for asset in inline
+            ),
+            "brotli": brotli is not None,
+        }
+
+
+# Empty until load_static_assets() runs at startup
+manifest = AssetManifest()
+
+
+def load_static_assets(root: str = STATIC_DIR) -> AssetManifest:
+    """Index STATIC_DIR; called at startup, or again after a rebuild"""
+    global manifest
+    manifest = AssetManifest.scan(Path(root))
+    return manifest
@@ -0,0 +1,118 @@
+"""
+Dedicated executor for blocking SQLite work.
+
+sqlite3 calls block on disk I/O (a commit can sit in fsync for a long time),
+so the async storage API hands them to worker threads instead of running
+them on the event loop. Reads use a small pool sized like the read-only
+connection pool; writes use a single thread so they land in submission order.
+
+Admission is bounded: once ``max_queue`` calls are in flight, further callers
+wait on the loop (without blocking it) until a slot frees up. Queue depth and
+wait time are tracked so we can tell when the database is the bottleneck.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from threading import Lock
+import time
+from typing import Any, Callable, Optional
+
+from app.metrics import Histogram
+
+
+class StorageExecutor:
+    def __init__(self, read_workers: int, max_queue: int):
+        self.read_workers = max(1, read_workers)
+        self.max_queue = max(1, max_queue)
+        self._read_pool: Optional[ThreadPoolExecutor] = None
+        self._write_pool: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._counter_lock = Lock()
+        self.queued = 0
+        self.running = 0
+        self.max_depth = 0
+        self.wait_seconds = Histogram()
+
+    async def run_read(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._read_pool is None:
+            self._read_pool = ThreadPoolExecutor(self.read_workers, thread_name_prefix="sqlite-read")
+        return await self._run(self._read_pool, True, fn, *args)
+
+    async def run_write(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._write_pool is None:
+            self._write_pool = ThreadPoolExecutor(1, thread_name_prefix="sqlite-write")
+        return await self._run(self._write_pool, False, fn, *args)
+
+    async def _run(
+        self, pool: ThreadPoolExecutor, abandonable: bool, fn: Callable[..., Any], *args: Any
+    ) -> Any:
+        """Run ``fn`` on ``pool``.
+
+        Reads are abandonable: if the caller is cancelled before a worker starts
+        the call, it is skipped. Writes always run once submitted.
+        """
+        enqueued_at = time.perf_counter()
+        with self._counter_lock:
+            self.queued += 1
+            self.max_depth = max(self.max_depth, self.queued + self.running)
+
+        state = {"started": False, "abandoned": False}
+        # Run in the caller's context so request timing sees the work
+        context = contextvars.copy_context()
+
+        def call() -> Any:
+            with self._counter_lock:
+                if state["abandoned"]:
+                    return None
+                state["started"] = True
+                self.queued -= 1
+                self.running += 1
+            self.wait_seconds.observe(time.perf_counter() - enqueued_at)
+            try:
+                return context.run(fn, *args)
+            finally:
+                with self._counter_lock:
+                    self.running -= 1
+
+        submitted = False
+        try:
+            async with self._get_slots():
+                future = asyncio.get_running_loop().run_in_executor(pool, call)
+                submitted = True
+                return await (future if abandonable else asyncio.shield(future))
+        except BaseException:
+            with self._counter_lock:
+                if not state["started"] and (abandonable or not submitted):
+                    state["abandoned"] = True
+                    self.queued -= 1
+            raise
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_queue)
+            self._slots_loop = loop
+        return self._slots
+
+    def shutdown(self) -> None:
+        for pool in (self._read_pool, self._write_pool):
+            if pool is not None:
+                pool.shutdown(wait=True)
+        self._read_pool = None
+        self._write_pool = None
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            queued, running, max_depth = self.queued, self.running, self.max_depth
+        return {
+            "queued": queued,
+            "running": running,
+            "depth": queued + running,
+            "maxDepth": max_depth,
+            "maxQueue": self.max_queue,
+            "waitSeconds": self.wait_seconds.snapshot(),
+        }
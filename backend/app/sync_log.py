@@ -0,0 +1,131 @@
+"""
+Change log behind the /game/sync delta protocol.
+
+Every sync response carries a cursor. The server remembers, per player, a
+small digest of what it sent under each of the last SYNC_LOG_DEPTH cursors:
+meter values, poop ids, a fingerprint per fish, and owned accessories. A client
+that comes back with one of those cursors gets only what changed since; an
+unknown cursor (evicted, from before a restart, or made up) gets a full
+snapshot instead.
+
+Cursors come from one process-wide counter seeded from the clock, so a
+cursor issued before a restart never matches one issued after it.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import json
+import os
+import time
+from typing import Optional
+
+
+SYNC_LOG_DEPTH = int(os.getenv("SYNC_LOG_DEPTH", "8"))
+SYNC_LOG_USERS = int(os.getenv("SYNC_LOG_USERS", "4096"))
+
+
+def _fingerprint(value) -> int:
+    return hash(json.dumps(value, sort_keys=True, default=str))
+
+
+def digest(state: dict) -> dict:
+    """What a delta is computed against; ``state`` is a full snapshot."""
+    tank = state["tank"]
+    return {
+        "gameState": dict(state["gameState"]),
+        "tank": {key: value for key, value in tank.items() if key != "poopPositions"},
+        "happiness": state["happiness"],
+        "poop": frozenset(poop["id"] for poop in tank.get("poopPositions", [])),
+        "fish": {fish["id"]: _fingerprint(fish) for fish in state["fish"]},
+        "ownedAccessories": tuple(state["ownedAccessories"]),
+    }
+
+
+def _changed(old: dict, new: dict) -> dict:
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+def delta(old: dict, state: dict, new: dict) -> dict:
+    """Changes from digest ``old`` to snapshot ``state`` (whose digest is ``new``)."""
+    changes = {}
+    game_state = _changed(old["gameState"], new["gameState"])
+    if game_state:
+        changes["gameState"] = game_state
+    tank = _changed(old["tank"], new["tank"])
+    if tank:
+        changes["tank"] = tank
+    if old["happiness"] != new["happiness"]:
+        changes["happiness"] = new["happiness"]
+
+    poop_added = new["poop"] - old["poop"]
+    if poop_added:
+        changes["poopAdded"] = [
+            poop for poop in state["tank"].get("poopPositions", []) if poop["id"] in poop_added
+        ]
+    if old["poop"] - new["poop"]:
+        changes["poopRemoved"] = sorted(old["poop"] - new["poop"])
+
+    upserted = [fish for fish in state["fish"] if old["fish"].get(fish["id"]) != new["fish"][fish["id"]]]
+    if upserted:
+        changes["fishUpserted"] = upserted
+    removed = old["fish"].keys() - new["fish"].keys()
+    if removed:
+        changes["fishRemoved"] = sorted(removed)
+
+    if old["ownedAccessories"] != new["ownedAccessories"]:
+        changes["ownedAccessories"] = list(new["ownedAccessories"])
+    return changes
+
+
+class SyncLog:
+    def __init__(self, depth: int, max_users: int):
+        self.depth = max(1, depth)
+        self.max_users = max(1, max_users)
+        self._logs: "OrderedDict[str, OrderedDict[int, dict]]" = OrderedDict()
+        self._next_cursor = int(time.time() * 1000)
+        self.deltas = 0
+        self.snapshots = 0
+
+    def get(self, username: str, cursor: Optional[int]) -> Optional[dict]:
+        log = self._logs.get(username)
+        if log is None or cursor is None:
+            return None
+        self._logs.move_to_end(username)
+        return log.get(cursor)
+
+    def record(self, username: str, entry: dict) -> int:
+        self._next_cursor += 1
+        cursor = self._next_cursor
+        log = self._logs.setdefault(username, OrderedDict())
+        self._logs.move_to_end(username)
+        log[cursor] = entry
+        while len(log) > self.depth:
+            log.popitem(last=False)
+        while len(self._logs) > self.max_users:
+            self._logs.popitem(last=False)
+        return cursor
+
+    def sync(self, username: str, since: Optional[int], state: dict) -> dict:
+        """The /game/sync response body for a full ``state`` snapshot."""
+        new = digest(state)
+        old = self.get(username, since)
+        if old is None:
+            self.snapshots += 1
+            return {"cursor": self.record(username, new), "full": True, **state}
+        self.deltas += 1
+        changes = delta(old, state, new)
+        # Nothing changed: the client's cursor is still current
+        cursor = since if not changes else self.record(username, new)
+        return {"cursor": cursor, "full": False, **changes}
+
+    def stats(self) -> dict:
+        return {
+            "players": len(self._logs),
+            "depth": self.depth,
+            "deltas": self.deltas,
+            "snapshots": self.snapshots,
+        }
+
+
+sync_log = SyncLog(SYNC_LOG_DEPTH, SYNC_LOG_USERS)
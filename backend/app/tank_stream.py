@@ -0,0 +1,155 @@
+"""
+Server-sent events for the tank meters (GET /game/stream).
+
+Instead of polling POST /game/tick, the tank page keeps one EventSource open.
+Every STREAM_CHECK_SECONDS the server derives the tank the same way a tick
+does and sends a ``tank`` event only when what the player can see changed:
+whole-percent meters, coins, capacity or the set of poop. A comment line goes
+out after STREAM_HEARTBEAT_SECONDS of silence so proxies keep the connection
+open and dead clients are noticed.
+
+Backpressure: only the latest state is ever sent, so nothing queues up behind
+a slow client. A send that can't complete within STREAM_SEND_TIMEOUT_SECONDS
+closes the stream, and at most STREAM_MAX_CONNECTIONS streams are open at a
+time (new ones get 503; the client falls back to polling).
+
+Each check reloads the player through the write-back cache, so the limit is
+also capped at USER_CACHE_SIZE: with more streams than cached players, every
+check would evict another player (writing them back if dirty) and read its
+own player from SQLite again, which costs more than the polling it replaces.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Awaitable, Callable
+
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.database import USER_CACHE_SIZE
+from app.game_config import GAME_STATE_FRESHNESS_SECONDS
+from app.responses import dumps
+
+
+STREAM_MAX_CONNECTIONS = int(os.getenv("STREAM_MAX_CONNECTIONS", "2000"))
+STREAM_CHECK_SECONDS = float(os.getenv("STREAM_CHECK_SECONDS", "5"))
+STREAM_HEARTBEAT_SECONDS = float(os.getenv("STREAM_HEARTBEAT_SECONDS", "25"))
+STREAM_SEND_TIMEOUT_SECONDS = float(os.getenv("STREAM_SEND_TIMEOUT_SECONDS", "10"))
+
+HEARTBEAT = b": ping\n\n"
+
+
+def stream_capacity(max_connections: int, cache_size: int) -> int:
+    """How many streams may be open: no more than the cache holds, if it's on"""
+    if cache_size > 0:
+        return min(max_connections, cache_size)
+    return max_connections
+
+
+def visible_state(state: dict) -> tuple:
+    """The parts of a tick body the tank page shows"""
+    return (
+        round(state["hunger"]),
+        round(state["cleanliness"]),
+        state["coins"],
+        state["maxFish"],
+        tuple(poop["id"] for poop in state["poopPositions"]),
+    )
+
+
+def tank_event(state: dict) -> bytes:
+    return b"event: tank\ndata: " + dumps(state) + b"\n\n"
+
+
+class TankStreams:
+    def __init__(self, max_connections: int):
+        self.max_connections = max_connections
+        self.open = 0
+        self.events = 0
+        self.heartbeats = 0
+        self.rejected = 0
+        self.send_timeouts = 0
+
+    def try_open(self) -> bool:
+        if self.open >= self.max_connections:
+            self.rejected += 1
+            return False
+        self.open += 1
+        return True
+
+    def close(self) -> None:
+        self.open -= 1
+
+    async def events_for(self, load_state: Callable[[], Awaitable[dict]]):
+        last = None
+        silent = 0.0
+        while True:
+            state = await load_state()
+            seen = visible_state(state)
+            if seen != last:
+                last = seen
+                silent = 0.0
+                self.events += 1
+                yield tank_event(state)
+            elif silent >= STREAM_HEARTBEAT_SECONDS:
+                silent = 0.0
+                self.heartbeats += 1
+                yield HEARTBEAT
+            await asyncio.sleep(STREAM_CHECK_SECONDS)
+            silent += STREAM_CHECK_SECONDS
+
+    def stats(self) -> dict:
+        return {
+            "open": self.open,
+            "maxConnections": self.max_connections,
+            "events": self.events,
+            "heartbeats": self.heartbeats,
+            "rejected": self.rejected,
+            "sendTimeouts": self.send_timeouts,
+        }
+
+
+tank_streams = TankStreams(stream_capacity(STREAM_MAX_CONNECTIONS, USER_CACHE_SIZE))
+
+
+class TankStreamResponse(StreamingResponse):
+    """Takes a slot in ``tank_streams`` when it starts sending and releases it
+    however the stream ends, so a response that never runs holds no slot.
+    Answers 503 when every slot is taken."""
+
+    def __init__(self, load_state: Callable[[], Awaitable[dict]]):
+        super().__init__(
+            tank_streams.events_for(load_state),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    async def __call__(self, scope, receive, send) -> None:
+        if not tank_streams.try_open():
+            refused = JSONResponse(
+                {"detail": "Too many open streams"},
+                status_code=503,
+                headers={"Retry-After": str(GAME_STATE_FRESHNESS_SECONDS)},
+            )
+            await refused(scope, receive, send)
+            return
+
+        async def send_with_timeout(message) -> None:
+            try:
+                await asyncio.wait_for(send(message), STREAM_SEND_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                tank_streams.send_timeouts += 1
+                raise
+
+        try:
+            await super().__call__(scope, receive, send_with_timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            tank_streams.close()
+
+
+def open_tank_stream(load_state: Callable[[], Awaitable[dict]]) -> TankStreamResponse:
+    """The stream response; it answers 503 itself when every stream slot is taken"""
+    return TankStreamResponse(load_state)
@@ -0,0 +1,252 @@
+"""
+Batch tick engine for active tanks.
+
+Optional (TICK_ENGINE=true, needs NumPy). Tanks that ticked recently are held
+as rows of parallel arrays: the simulation anchors (stored hunger,
+lastActiveAt, lastPoopTime, stored poop count, fish count) plus the derived
+hunger, poop count and cleanliness. A background task advances every row in
+one vectorized pass each TICK_ENGINE_INTERVAL_SECONDS using the same closed
+form as app/simulation.py, then materializes the tanks whose anchors went
+stale and saves them together.
+
+With the engine on, POST /game/tick never writes: it reads the row computed by
+the last pass. Rows for tanks that stop ticking are dropped after
+TICK_ENGINE_IDLE_SECONDS without a write; their state stays derivable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+import os
+import time
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from app.database import get_user, save_users
+from app.game_config import (
+    HUNGER_DECAY_PER_MINUTE, POOP_GENERATION_INTERVAL, POOP_CLEANLINESS_PENALTY,
+    MAX_CATCH_UP_SECONDS, REBASE_AFTER_SECONDS,
+)
+from app.metrics import Histogram
+from app.models import now_utc
+from app.simulation import derive_tank, ensure_tz_aware, materialize, pending_poop
+
+
+TICK_ENGINE = os.getenv("TICK_ENGINE", "false").lower() == "true"
+TICK_ENGINE_INTERVAL_SECONDS = float(os.getenv("TICK_ENGINE_INTERVAL_SECONDS", "5"))
+TICK_ENGINE_IDLE_SECONDS = float(os.getenv("TICK_ENGINE_IDLE_SECONDS", "180"))
+
+INITIAL_CAPACITY = 1024
+
+logger = logging.getLogger(__name__)
+
+
+def _anchors(user: dict) -> tuple:
+    tank = user.get("tank", {})
+    return (
+        float(tank.get("hunger", 100)),
+        ensure_tz_aware(user.get("gameState", {}).get("lastActiveAt")).timestamp(),
+        ensure_tz_aware(tank.get("lastPoopTime")).timestamp(),
+        len(tank.get("poopPositions", [])),
+        len(user.get("fish", [])),
+    )
+
+
+class TickEngine:
+    """Struct-of-arrays store of active tanks, advanced in one pass."""
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self._slots: dict[str, int] = {}
+        self._names: list[Optional[str]] = []
+        self._free: list[int] = []
+        self._allocate(max(1, capacity))
+        self.last_pass: Optional[float] = None
+        self.rebased = 0
+        self.pass_seconds = Histogram()
+
+    def _allocate(self, capacity: int) -> None:
+        old = getattr(self, "_capacity", 0)
+        self._capacity = capacity
+        self._names.extend([None] * (capacity - old))
+        for name in ("hunger_anchor", "last_active", "last_poop", "stored_poop", "fish",
+                     "last_seen", "hunger", "poop", "cleanliness"):
+            grown = np.zeros(capacity)
+            if old:
+                grown[:old] = getattr(self, name)
+            setattr(self, name, grown)
+        active = np.zeros(capacity, dtype=bool)
+        if old:
+            active[:old] = self.active
+        self.active = active
+        self._free.extend(range(capacity - 1, old - 1, -1))
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def track(self, user: dict, now: float, seen: bool = True) -> int:
+        """Load (or refresh) a tank's anchors and compute its row right away."""
+        username = user["username"]
+        slot = self._slots.get(username)
+        if slot is None:
+            if not self._free:
+                self._allocate(self._capacity * 2)
+            slot = self._free.pop()
+            self._slots[username] = slot
+            self._names[slot] = username
+            self.active[slot] = True
+        (self.hunger_anchor[slot], self.last_active[slot], self.last_poop[slot],
+         self.stored_poop[slot], self.fish[slot]) = _anchors(user)
+        if seen:
+            self.last_seen[slot] = now
+        self._advance(slice(slot, slot + 1), now)
+        return slot
+
+    def untrack(self, username: str) -> None:
+        slot = self._slots.pop(username, None)
+        if slot is not None:
+            self._names[slot] = None
+            self.active[slot] = False
+            self._free.append(slot)
+
+    def read(self, user: dict, now: float) -> int:
+        """Slot holding the user's current row, re-tracking if they acted since."""
+        slot = self._slots.get(user["username"])
+        if slot is None or self._stale(slot, user):
+            return self.track(user, now)
+        self.last_seen[slot] = now
+        return slot
+
+    def _stale(self, slot: int, user: dict) -> bool:
+        return _anchors(user) != (
+            self.hunger_anchor[slot], self.last_active[slot], self.last_poop[slot],
+            self.stored_poop[slot], self.fish[slot],
+        )
+
+    def _advance(self, rows, now: float):
+        elapsed = now - self.last_active[rows]
+        caught_up = np.clip(elapsed, 0, MAX_CATCH_UP_SECONDS)
+        self.hunger[rows] = np.maximum(
+            0, self.hunger_anchor[rows] - HUNGER_DECAY_PER_MINUTE * caught_up / 60
+        )
+        fish = self.fish[rows]
+        due_poop = np.floor(np.maximum(now - self.last_poop[rows], 0) / POOP_GENERATION_INTERVAL)
+        pending = np.minimum(due_poop, fish)
+        self.poop[rows] = self.stored_poop[rows] + pending
+        self.cleanliness[rows] = np.maximum(0, 100 - self.poop[rows] * POOP_CLEANLINESS_PENALTY)
+        return (elapsed >= REBASE_AFTER_SECONDS) | ((fish > 0) & (pending >= fish))
+
+    def advance(self, now: float) -> tuple[list[str], list[str]]:
+        """Advance every row to ``now``.
+
+        Returns the usernames whose anchors need a rebase and the ones that
+        went idle (and were dropped).
+        """
+        started = time.perf_counter()
+        rows = slice(0, self._capacity)
+        active = self.active
+        stale = self._advance(rows, now) & active
+        idle = active & (now - self.last_seen >= TICK_ENGINE_IDLE_SECONDS)
+        idle_names = [self._names[slot] for slot in np.flatnonzero(idle)]
+        for username in idle_names:
+            self.untrack(username)
+        due = [self._names[slot] for slot in np.flatnonzero(stale & ~idle)]
+        self.last_pass = now
+        self.pass_seconds.observe(time.perf_counter() - started)
+        return due, idle_names
+
+    def tank(self, user: dict, slot: int) -> dict:
+        """The tank fields of a row, shaped like ``derive_tank``'s output."""
+        tank = user.get("tank", {})
+        stored = tank.get("poopPositions", [])
+        last_poop = ensure_tz_aware(tank.get("lastPoopTime"))
+        pending = int(self.poop[slot]) - len(stored)
+        return {
+            **tank,
+            "hunger": float(self.hunger[slot]),
+            "cleanliness": float(self.cleanliness[slot]),
+            "poopPositions": stored + pending_poop(user["username"], last_poop, pending),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "tracked": len(self),
+            "capacity": self._capacity,
+            "rebased": self.rebased,
+            "passSeconds": self.pass_seconds.snapshot(),
+        }
+
+
+_engine: Optional[TickEngine] = None
+_task: Optional[asyncio.Task] = None
+
+
+def tick_engine_enabled() -> bool:
+    return _engine is not None
+
+
+async def start_tick_engine() -> None:
+    global _engine, _task
+    if not TICK_ENGINE:
+        return
+    if np is None:
+        logger.warning("TICK_ENGINE is set but NumPy is not installed; ticks stay per-request")
+        return
+    _engine = TickEngine()
+    _task = asyncio.create_task(_engine_loop())
+
+
+async def stop_tick_engine() -> None:
+    global _engine, _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+        _task = None
+    _engine = None
+
+
+def read_tank(user: dict, now: datetime) -> dict:
+    """Current tank for a tick: the engine's row when running, else derived."""
+    if _engine is None:
+        return derive_tank(user, now)
+    return _engine.tank(user, _engine.read(user, now.timestamp()))
+
+
+async def rebase_due(engine: TickEngine, now: datetime) -> int:
+    """Advance all rows and save every tank whose anchors went stale."""
+    due, _ = engine.advance(now.timestamp())
+    users = []
+    for username in due:
+        user = await get_user(username)
+        if user is None or "gameState" not in user:
+            engine.untrack(username)
+            continue
+        materialize(user, now)
+        user["updatedAt"] = now
+        users.append(user)
+    await save_users(users, ("gameState", "tank"))
+    for user in users:
+        engine.track(user, now.timestamp(), seen=False)
+    engine.rebased += len(users)
+    return len(users)
+
+
+async def _engine_loop() -> None:
+    while True:
+        await asyncio.sleep(TICK_ENGINE_INTERVAL_SECONDS)
+        try:
+            await rebase_due(_engine, now_utc())
+        except Exception:
+            logger.exception("Tick engine pass failed; will retry")
+
+
+def tick_engine_stats() -> Optional[dict]:
+    return _engine.stats() if _engine is not None else None
@@ -0,0 +1,120 @@
+"""
+Write-back cache of decoded user state.
+
+The same few hundred active players hit the game and fishing routes over and
+over, so their decoded user dicts are kept in memory. Reads for cached users
+skip SQLite and JSON decoding entirely; writes only mark the entry dirty and
+are persisted later by the database module (periodic flush, eviction, and
+shutdown).
+
+The cache is an identity map: callers get the cached dict itself, mutate it,
+and hand it back through ``save_user``. It is only touched from the event loop
+thread and assumes a single worker process owns the SQLite file.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Optional
+
+# A pending write-back: the user plus the sections that changed (None = all).
+DirtyUser = tuple[dict, Optional[frozenset]]
+
+
+class UserCache:
+    """Bounded LRU of user dicts with dirty tracking."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._dirty: dict[str, Optional[frozenset]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, username: str) -> Optional[dict]:
+        user = self._entries.get(username)
+        if user is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(username)
+        self.hits += 1
+        return user
+
+    def peek(self, username: str) -> Optional[dict]:
+        """Look up without touching LRU order or hit counters."""
+        return self._entries.get(username)
+
+    def adopt(self, user: dict) -> tuple[dict, list[DirtyUser]]:
+        """Cache a freshly loaded user unless a newer copy is already cached.
+
+        Returns the dict callers should use plus any dirty users evicted to
+        make room, which the caller must persist.
+        """
+        cached = self._entries.get(user["username"])
+        if cached is not None:
+            self._entries.move_to_end(user["username"])
+            return cached, []
+        self._entries[user["username"]] = user
+        return user, self._evict()
+
+    def put_dirty(self, user: dict, sections: Optional[frozenset] = None) -> list[DirtyUser]:
+        """Store a mutated user and mark the changed sections for write-back."""
+        username = user["username"]
+        self._entries[username] = user
+        self._entries.move_to_end(username)
+        self._mark(username, sections)
+        return self._evict()
+
+    def take_dirty(self) -> list[DirtyUser]:
+        """Return every dirty user with its changed sections and mark them clean."""
+        dirty = [
+            (self._entries[name], sections)
+            for name, sections in self._dirty.items()
+            if name in self._entries
+        ]
+        self._dirty.clear()
+        return dirty
+
+    def mark_dirty(self, dirty: list[DirtyUser]) -> None:
+        """Re-flag users whose write-back failed so the next flush retries."""
+        for user, sections in dirty:
+            username = user["username"]
+            if username not in self._entries:
+                self._entries[username] = user
+            self._mark(username, sections)
+
+    def _mark(self, username: str, sections: Optional[frozenset]) -> None:
+        if username in self._dirty:
+            pending = self._dirty[username]
+            sections = None if pending is None or sections is None else pending | sections
+        self._dirty[username] = sections
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._dirty.clear()
+
+    def _evict(self) -> list[DirtyUser]:
+        evicted = []
+        while len(self._entries) > self.max_size:
+            username, user = self._entries.popitem(last=False)
+            self.evictions += 1
+            if username in self._dirty:
+                evicted.append((user, self._dirty.pop(username)))
+        return evicted
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "dirty": len(self._dirty),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1 @@
+# Storage and load benchmarks (not shipped in the runtime image)
@@ -0,0 +1,50 @@
+"""
+Shared player fixtures for the benchmarks.
+"""
+
+from datetime import datetime, timezone
+import uuid
+
+from app.game_config import FISH_SPECIES, STARTING_MAX_FISH, SHOP_ITEMS
+
+
+def full_tank_user(username: str, poop: int = 10) -> dict:
+    """A player with a full tank, accessorised fish, poop and a big closet."""
+    now = datetime.now(timezone.utc)
+    hats = [item_id for item_id, item in SHOP_ITEMS.items() if item["category"] == "hat"]
+    effects = [item_id for item_id, item in SHOP_ITEMS.items() if item["category"] == "effect"]
+    fish = [
+        {
+            "id": str(uuid.uuid4()),
+            "species": FISH_SPECIES[i % len(FISH_SPECIES)],
+            "name": f"Captain Bubbles {i}",
+            "color": "#ff8844",
+            "size": ("sm", "md", "lg")[i % 3],
+            "rarity": ("common", "uncommon", "rare", "legendary")[i % 4],
+            "accessories": {
+                "hat": hats[i % len(hats)],
+                "glasses": None,
+                "effect": effects[i % len(effects)],
+            },
+            "createdAt": now,
+        }
+        for i in range(STARTING_MAX_FISH)
+    ]
+    return {
+        "username": username,
+        "password_hash": "$2b$12$" + "x" * 53,
+        "gameState": {"coins": 1234, "maxFish": STARTING_MAX_FISH, "lastActiveAt": now},
+        "tank": {
+            "hunger": 80.0,
+            "cleanliness": 100.0 - poop * 3.0,
+            "poopPositions": [
+                {"id": str(uuid.uuid4()), "x": 0.5, "y": 0.75, "createdAt": now}
+                for _ in range(poop)
+            ],
+            "lastPoopTime": now,
+        },
+        "fish": fish,
+        "ownedAccessories": list(SHOP_ITEMS),
+        "createdAt": now,
+        "updatedAt": now,
+    }
@@ -0,0 +1,242 @@
+"""
+End-to-end load test: simulated players against a real server.
+
+Starts the app under uvicorn (one worker, fresh SQLite file, rate limiting
+off since every player shares 127.0.0.1) and runs N players through a play
+session: sign up, load the tank, then fish, keep/release/swap what they
+catch, tick every --tick-seconds and shop now and then, with --think-ms
+between actions.
+
+Reports per-route p50/p95/p99 latency, error counts, overall throughput and
+how much the database grew. --save writes the results as JSON; --compare
+diffs a run against a saved baseline, so results can be compared across
+commits.
+
+    cd backend
+    pip install httpx
+    python -m benchmarks.load --players 32 --seconds 30 --save benchmarks/results/main.json
+    python -m benchmarks.load --players 32 --seconds 30 --compare benchmarks/results/main.json
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict
+import json
+import os
+import random
+import subprocess
+import time
+
+import httpx
+
+from benchmarks.server import Server, rss_mb, sqlite_bytes
+
+
+PERCENTILES = (50, 95, 99)
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        # 503s with Retry-After: load shed on purpose, not failures
+        self.shed = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, method: str, route: str, url: str, **kwargs):
+        """One request, timed under its route template (e.g. /fishing/catch/{id})"""
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.latencies[route].append((time.perf_counter() - start) * 1000)
+        if response.status_code == 503 and "retry-after" in response.headers:
+            self.shed[route] += 1
+        elif response.status_code >= 500 or response.status_code == 429:
+            self.errors[route] += 1
+        return response
+
+
+def _percentile(ordered: list[float], pct: int) -> float:
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _sign_up(client: httpx.AsyncClient, index: int, recorder: Recorder) -> None:
+    credentials = {"username": f"player{index}", "password": "password1"}
+    response = await recorder.call(client, "POST", "/sessions", "/sessions", json=credentials)
+    while response.status_code == 503:
+        # Password pool is full; back off as asked
+        await asyncio.sleep(float(response.headers.get("retry-after", "1")))
+        response = await recorder.call(client, "POST", "/sessions", "/sessions", json=credentials)
+
+
+async def _play(
+    client: httpx.AsyncClient, index: int, recorder: Recorder, deadline: float,
+    think: float, tick_every: float,
+) -> None:
+    rng = random.Random(index)
+    state = (await recorder.call(client, "GET", "/game", "/game")).json()
+    fish_ids = [fish["id"] for fish in state["fish"]]
+    max_fish = state["gameState"]["maxFish"]
+    next_tick = time.monotonic() + tick_every
+
+    while time.monotonic() < deadline:
+        if time.monotonic() >= next_tick:
+            await recorder.call(client, "POST", "/game/tick", "/game/tick")
+            next_tick += tick_every
+
+        spawns = (await recorder.call(client, "GET", "/fishing/spawn", "/fishing/spawn")).json()["spawns"]
+        spawn = rng.choice(spawns)
+        await asyncio.sleep(think)
+        caught = (await recorder.call(
+            client, "POST", "/fishing/catch/{id}", f"/fishing/catch/{spawn['id']}",
+            params={"species": spawn["species"], "size": spawn["size"], "rarity": spawn["rarity"]},
+        )).json()
+
+        if caught.get("resultType") == "fish":
+            catch_id = caught["fish"]["id"]
+            await asyncio.sleep(think)
+            if len(fish_ids) < max_fish and rng.random() < 0.7:
+                response = await recorder.call(
+                    client, "POST", "/fishing/keep", "/fishing/keep", json={"fishId": catch_id}
+                )
+                if response.status_code == 200:
+                    fish_ids.append(response.json()["fish"]["id"])
+            elif fish_ids and rng.random() < 0.5:
+                released = rng.choice(fish_ids)
+                response = await recorder.call(
+                    client, "POST", "/fishing/swap", "/fishing/swap",
+                    json={"caughtFishId": catch_id, "releaseFishId": released},
+                )
+                if response.status_code == 200:
+                    fish_ids.remove(released)
+                    fish_ids.append(response.json()["addedFish"]["id"])
+            else:
+                await recorder.call(
+                    client, "POST", "/fishing/release", "/fishing/release", json={"fishId": catch_id}
+                )
+
+        if rng.random() < 0.1:
+            shop = (await recorder.call(client, "GET", "/shop/items", "/shop/items")).json()
+            affordable = [item for item in shop["items"] if item["canBuy"]]
+            if affordable:
+                item = rng.choice(affordable)
+                await recorder.call(client, "POST", "/shop/buy/{id}", f"/shop/buy/{item['id']}")
+        await asyncio.sleep(think)
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(players: int, seconds: float, think_ms: float, tick_seconds: float) -> dict:
+    server = Server({"RATE_LIMIT_ENABLED": "false"})
+    try:
+        recorder = Recorder()
+        clients = [
+            httpx.AsyncClient(base_url=f"{server.base_url}/api", timeout=30) for _ in range(players)
+        ]
+        db_before = sqlite_bytes(server.sqlite_path, checkpoint=True)
+        # Sign-ups are bcrypt-bound; run them before the clock starts
+        await asyncio.gather(*(
+            _sign_up(client, index, recorder) for index, client in enumerate(clients)
+        ))
+        start = time.monotonic()
+        await asyncio.gather(*(
+            _play(client, index, recorder, start + seconds, think_ms / 1000, tick_seconds)
+            for index, client in enumerate(clients)
+        ))
+        elapsed = time.monotonic() - start
+        rss = rss_mb(server.pid)
+        for client in clients:
+            await client.aclose()
+    finally:
+        server.stop()
+    # After shutdown, so cached writes are flushed and the WAL checkpointed
+    db_after = sqlite_bytes(server.sqlite_path)
+
+    routes = {}
+    for route, samples in sorted(recorder.latencies.items()):
+        ordered = sorted(samples)
+        routes[route] = {
+            "requests": len(ordered),
+            "errors": recorder.errors[route],
+            "shed": recorder.shed[route],
+            **{f"p{pct}": round(_percentile(ordered, pct), 2) for pct in PERCENTILES},
+        }
+    total = sum(
+        stats["requests"] for route, stats in routes.items() if route != "/sessions"
+    )
+    return {
+        "commit": _git_commit(),
+        "config": {
+            "players": players, "seconds": seconds,
+            "thinkMs": think_ms, "tickSeconds": tick_seconds,
+        },
+        "throughput": round(total / elapsed, 1),
+        "requests": total,
+        "errors": sum(route["errors"] for route in routes.values()),
+        "dbGrowthBytes": db_after - db_before,
+        "workerRssMb": round(rss, 1),
+        "routes": routes,
+    }
+
+
+def _print(results: dict) -> None:
+    print(f"commit {results['commit']}  {results['config']}")
+    print(f"{'route':<22}{'requests':>9}{'errors':>8}{'shed':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for route, stats in results["routes"].items():
+        print(f"{route:<22}{stats['requests']:>9}{stats['errors']:>8}{stats['shed']:>6}"
+              f"{stats['p50']:>9.1f}{stats['p95']:>9.1f}{stats['p99']:>9.1f}")
+    print(f"\nthroughput {results['throughput']} req/s over {results['requests']} requests "
+          f"(sign-ups excluded), "
+          f"{results['errors']} errors")
+    print(f"database grew {results['dbGrowthBytes'] / 1024:.0f} KiB, "
+          f"worker RSS {results['workerRssMb']} MB")
+
+
+def _compare(results: dict, baseline: dict) -> None:
+    def change(new: float, old: float) -> str:
+        return f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+
+    print(f"\nvs baseline {baseline['commit']}  {baseline['config']}")
+    print(f"{'route':<22}{'p50':>8}{'p95':>8}{'p99':>8}")
+    for route, stats in results["routes"].items():
+        old = baseline["routes"].get(route)
+        if old is None:
+            print(f"{route:<22}{'new':>8}")
+            continue
+        print(f"{route:<22}" + "".join(
+            f"{change(stats[f'p{pct}'], old[f'p{pct}']):>8}" for pct in PERCENTILES
+        ))
+    print(f"throughput {change(results['throughput'], baseline['throughput'])}, "
+          f"database growth {change(results['dbGrowthBytes'], baseline['dbGrowthBytes'])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--think-ms", type=float, default=200)
+    parser.add_argument("--tick-seconds", type=float, default=10)
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="diff against a JSON file written by --save")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.players, args.seconds, args.think_ms, args.tick_seconds))
+    _print(results)
+    if args.compare:
+        with open(args.compare) as baseline:
+            _compare(results, json.load(baseline))
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w") as out:
+            json.dump(results, out, indent=2)
+        print(f"\nsaved {args.save}")
+
+
+if __name__ == "__main__":
+    main()
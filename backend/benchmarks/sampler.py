@@ -0,0 +1,75 @@
+"""
+Alias-table sampler vs the old cumulative-weight draws.
+
+Times a rarity draw and a /fishing/spawn batch both ways: the code the fishing
+router used before (kept here as the baseline) and app.sampler.
+
+    cd backend
+    python -m benchmarks.sampler --draws 200000
+"""
+
+import argparse
+import random
+import time
+import uuid
+
+from app.game_config import RARITY_WEIGHTS, RARITY_SPEED, FISH_SPECIES
+from app.sampler import RARITY_TABLE, SpawnBuffer
+
+
+def legacy_rarity_choice():
+    total = sum(RARITY_WEIGHTS.values())
+    r = random.uniform(0, total)
+    cumulative = 0
+    for rarity, weight in RARITY_WEIGHTS.items():
+        cumulative += weight
+        if r <= cumulative:
+            return rarity
+    return "common"
+
+
+def legacy_spawns(count: int) -> list[dict]:
+    spawns = []
+    for _ in range(count):
+        rarity = legacy_rarity_choice()
+        direction = random.choice([-1, 1])
+        spawns.append({
+            "id": str(uuid.uuid4()),
+            "species": random.choice(FISH_SPECIES),
+            "rarity": rarity,
+            "x": random.uniform(0.1, 0.9),
+            "y": random.uniform(0.2, 0.8),
+            "speed": RARITY_SPEED[rarity],
+            "direction": direction,
+            "size": random.choice(["sm", "md", "lg"]),
+        })
+    return spawns
+
+
+def per_call_us(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--draws", type=int, default=200_000)
+    parser.add_argument("--spawn-calls", type=int, default=20_000)
+    args = parser.parse_args()
+
+    buffer = SpawnBuffer()
+    rows = [
+        ("rarity draw", per_call_us(legacy_rarity_choice, args.draws),
+         per_call_us(RARITY_TABLE.sample, args.draws)),
+        ("spawn call (5 fish)", per_call_us(lambda: legacy_spawns(5), args.spawn_calls),
+         per_call_us(lambda: buffer.take(5), args.spawn_calls)),
+    ]
+    print(f"{'operation':<22}{'legacy us':>11}{'sampler us':>12}{'speedup':>9}")
+    for name, legacy, sampler in rows:
+        print(f"{name:<22}{legacy:>11.2f}{sampler:>12.2f}{legacy / sampler:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Response encoding cost on the hot routes.
+
+Compares FastAPI's default path (validate the dict against the response model,
+run jsonable_encoder, stdlib json) with fast_json for the bodies of GET /game,
+POST /game/tick and GET /fishing/spawn, using a player with a full tank. GET
+/game is also timed as actually served, with cached fish fragments spliced in.
+
+    cd backend
+    python -m benchmarks.serialization
+"""
+
+import random
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+import anyio
+
+from app.models import FishingSpawnsResponse, GameStateResponse, TickResponse
+from app.responses import fast_json, orjson
+from app.routers.game import calculate_happiness, game_snapshot, game_state_body
+from app.sampler import generate_spawns
+from benchmarks.fixtures import full_tank_user
+
+
+ROUNDS = 2000
+
+
+def _tick_body(snapshot: dict) -> dict:
+    tank = snapshot["tank"]
+    return {
+        "hunger": tank["hunger"],
+        "cleanliness": tank["cleanliness"],
+        "happiness": calculate_happiness(tank["hunger"], tank["cleanliness"]),
+        "coins": snapshot["gameState"]["coins"],
+        "maxFish": snapshot["gameState"]["maxFish"],
+        "poopCount": len(tank["poopPositions"]),
+        "poopPositions": tank["poopPositions"],
+    }
+
+
+def _per_call_us(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return (time.perf_counter() - start) / ROUNDS * 1e6
+
+
+async def _validated(field, body: dict) -> bytes:
+    content = await serialize_response(field=field, response_content=body)
+    return JSONResponse(content).body
+
+
+def main() -> None:
+    user = full_tank_user("full_tank")
+    snapshot = game_snapshot(user)
+    bodies = {
+        "GET /game": (GameStateResponse, snapshot),
+        "POST /game/tick": (TickResponse, _tick_body(snapshot)),
+        "GET /fishing/spawn": (
+            FishingSpawnsResponse, {"spawns": generate_spawns(6, random.Random(7))}
+        ),
+    }
+
+    print(f"encoder: {'orjson' if orjson is not None else 'json'}")
+    print(f"{'route':<20}{'fastapi us':>12}{'fast_json us':>14}{'speedup':>9}")
+    for route, (model, body) in bodies.items():
+        field = create_response_field(name="response", type_=model)
+
+        def default_path():
+            anyio.run(_validated, field, body)
+
+        def baseline():
+            anyio.run(anyio.sleep, 0)
+
+        loop_cost = _per_call_us(baseline)
+        slow = _per_call_us(default_path) - loop_cost
+        fast = _per_call_us(lambda: fast_json(body).body)
+        print(f"{route:<20}{slow:>12.1f}{fast:>14.1f}{slow / fast:>8.1f}x")
+
+    # Both include building the snapshot from the stored user
+    game_state_body(user)
+    whole = _per_call_us(lambda: fast_json(game_snapshot(user)).body)
+    spliced = _per_call_us(lambda: game_state_body(user))
+    print(f"GET /game from the user: {whole:.1f} us whole, {spliced:.1f} us with cached fish")
+
+
+if __name__ == "__main__":
+    main()
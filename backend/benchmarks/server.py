@@ -0,0 +1,70 @@
+"""
+Run the app under uvicorn in a subprocess for the end-to-end benchmarks.
+"""
+
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Optional
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmRSS not found")
+
+
+def sqlite_bytes(path: str, checkpoint: bool = False) -> int:
+    """Database size including the WAL; ``checkpoint`` folds the WAL in first"""
+    if checkpoint:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.close()
+    return sum(
+        os.path.getsize(path + suffix)
+        for suffix in ("", "-wal")
+        if os.path.exists(path + suffix)
+    )
+
+
+class Server:
+    """One uvicorn worker on a free port, against a fresh SQLite file."""
+
+    def __init__(self, env: Optional[dict] = None):
+        self.port = free_port()
+        self.sqlite_path = os.path.join(tempfile.mkdtemp(), "bench.sqlite")
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(self.port),
+             "--log-level", "warning", "--timeout-graceful-shutdown", "1"],
+            env={**os.environ, "SQLITE_PATH": self.sqlite_path, **(env or {})},
+        )
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(f"{self.base_url}/health")
+                return
+            except OSError:
+                time.sleep(0.1)
+        self.stop()
+        raise RuntimeError("server did not start")
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def stop(self) -> None:
+        self.process.terminate()
+        self.process.wait(timeout=30)
@@ -0,0 +1,92 @@
+"""
+How many idle GET /game/stream connections one worker holds in 180 MB.
+
+Starts the app under uvicorn in a subprocess (one worker, as in production),
+signs one player in, then opens idle streams in steps. Each stream must
+deliver its first "tank" event before the step counts. The worker's resident
+memory is read from /proc after each step, and the per-connection cost is
+extrapolated to the container limit.
+
+    cd backend
+    python -m benchmarks.sse_capacity --steps 250 500 1000 2000
+"""
+
+import argparse
+import asyncio
+import resource
+import urllib.request
+
+from benchmarks.server import Server, rss_mb
+
+CONTAINER_LIMIT_MB = 180
+
+
+def _sign_in(base_url: str) -> str:
+    request = urllib.request.Request(
+        f"{base_url}/api/sessions",
+        data=b'{"username":"streamer","password":"password1"}',
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:
+        cookie = response.headers["set-cookie"]
+    return cookie.split(";", 1)[0]
+
+
+async def _open_stream(port: int, cookie: str) -> asyncio.StreamWriter:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"GET /api/game/stream HTTP/1.1\r\nHost: localhost\r\nCookie: {cookie}\r\n"
+        "Accept: text/event-stream\r\n\r\n".encode()
+    )
+    status = await reader.readline()
+    if b" 200 " not in status:
+        raise RuntimeError(f"stream refused: {status!r}")
+    await reader.readuntil(b"event: tank")
+    return writer
+
+
+async def _run(steps: list[int]) -> None:
+    server = Server({"STREAM_MAX_CONNECTIONS": "1000000"})
+    port = server.port
+    writers = []
+    try:
+        cookie = _sign_in(server.base_url)
+        baseline = rss_mb(server.pid)
+        print(f"worker RSS before any streams: {baseline:.1f} MB")
+        print(f"{'streams':>8}{'RSS MB':>10}{'KB/stream':>12}")
+        for target in steps:
+            while len(writers) < target:
+                batch = min(100, target - len(writers))
+                writers += await asyncio.gather(
+                    *(_open_stream(port, cookie) for _ in range(batch))
+                )
+            await asyncio.sleep(1)
+            rss = rss_mb(server.pid)
+            per_stream_kb = (rss - baseline) * 1024 / len(writers)
+            print(f"{len(writers):>8}{rss:>10.1f}{per_stream_kb:>12.1f}")
+
+        capacity = (CONTAINER_LIMIT_MB - baseline) * 1024 / per_stream_kb
+        print(f"\n~{capacity:,.0f} idle streams fit in {CONTAINER_LIMIT_MB} MB "
+              f"(set STREAM_MAX_CONNECTIONS below this)")
+    finally:
+        for writer in writers:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for writer in writers), return_exceptions=True)
+        # Give the worker a moment to see the disconnects before stopping it
+        await asyncio.sleep(1)
+        server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, nargs="+", default=[250, 500, 1000, 2000])
+    args = parser.parse_args()
+
+    # Both ends of every stream live on this machine
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    asyncio.run(_run(sorted(args.steps)))
+
+
+if __name__ == "__main__":
+    main()
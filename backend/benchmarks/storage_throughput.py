@@ -0,0 +1,79 @@
+"""
+Storage throughput with concurrent simulated players.
+
+Each player thread loops over the storage calls behind one round of play:
+three reads (GET /game, /shop/items, /shop/owned) and one write (a tick).
+Runs with the read-only pool and again with reads forced through the writer
+connection, which is how the store behaved before WAL pooling.
+
+    cd backend
+    python -m benchmarks.storage_throughput --players 1 8 64 --seconds 5
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("SQLITE_PATH", os.path.join(tempfile.mkdtemp(), "bench.sqlite"))
+os.environ["USER_CACHE_SIZE"] = "0"
+
+import asyncio  # noqa: E402
+
+from app import database  # noqa: E402
+from benchmarks.fixtures import full_tank_user  # noqa: E402
+
+
+def _player_loop(username: str, deadline: float, counts: list[int]) -> None:
+    reads = writes = 0
+    while time.perf_counter() < deadline:
+        for _ in range(3):
+            user = database._fetch_user(username)
+            reads += 1
+        user["tank"]["hunger"] = max(0.0, user["tank"]["hunger"] - 0.1)
+        database._write_users([user])
+        writes += 1
+    counts.append((reads, writes))
+
+
+def run(players: int, seconds: float) -> tuple[float, float]:
+    deadline = time.perf_counter() + seconds
+    counts: list = []
+    threads = [
+        threading.Thread(target=_player_loop, args=(f"player_{i}", deadline, counts))
+        for i in range(players)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    reads = sum(c[0] for c in counts)
+    writes = sum(c[1] for c in counts)
+    return reads / seconds, writes / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--players", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--read-pool", type=int, default=database.SQLITE_READ_POOL_SIZE)
+    args = parser.parse_args()
+
+    asyncio.run(database.connect_to_mongo())
+    database._write_users([full_tank_user(f"player_{i}") for i in range(max(args.players))])
+
+    print(f"SQLite: {database.sqlite_path()} (synchronous={database.SQLITE_SYNCHRONOUS})")
+    print(f"{'mode':<14}{'players':>8}{'reads/s':>12}{'writes/s':>12}")
+    for label, pool_size in (("serialized", 0), (f"wal+pool({args.read_pool})", args.read_pool)):
+        database._close_readers()
+        database.SQLITE_READ_POOL_SIZE = pool_size
+        for players in args.players:
+            reads, writes = run(players, args.seconds)
+            print(f"{label:<14}{players:>8}{reads:>12.0f}{writes:>12.0f}")
+
+    asyncio.run(database.close_mongo_connection())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Payload size of GET /game snapshots vs /game/sync deltas.
+
+For a player with a full tank, encodes the full snapshot and the delta for a
+few typical changes the way FastAPI would send them.
+
+    cd backend
+    python -m benchmarks.sync_payload
+"""
+
+from datetime import timedelta
+import json
+
+from fastapi.encoders import jsonable_encoder
+
+from app.routers.game import game_snapshot
+from app.sync_log import SyncLog
+from benchmarks.fixtures import full_tank_user
+
+
+def _size(body: dict) -> int:
+    return len(json.dumps(jsonable_encoder(body), separators=(",", ":")))
+
+
+def _rename(user):
+    user["fish"][3]["name"] = "Sir Splash"
+
+
+def _add_poop(user):
+    user["tank"]["poopPositions"].append(
+        {"id": "new-poop", "x": 0.4, "y": 0.8, "createdAt": user["updatedAt"]}
+    )
+
+
+def _time_passes(user):
+    user["gameState"]["lastActiveAt"] -= timedelta(seconds=30)
+
+
+def _buy_hat(user):
+    user["gameState"]["coins"] -= 50
+    user["ownedAccessories"] = user["ownedAccessories"][:-1]
+
+
+CHANGES = {
+    "nothing": lambda user: None,
+    "hunger decays": _time_passes,
+    "rename a fish": _rename,
+    "new poop": _add_poop,
+    "buy an accessory": _buy_hat,
+}
+
+
+def main() -> None:
+    print(f"{'change':<20}{'snapshot bytes':>16}{'delta bytes':>13}")
+    for name, change in CHANGES.items():
+        log = SyncLog(depth=8, max_users=1)
+        user = full_tank_user("full_tank")
+        first = log.sync("full_tank", None, game_snapshot(user))
+        change(user)
+        snapshot = game_snapshot(user)
+        delta = log.sync("full_tank", first["cursor"], snapshot)
+        print(f"{name:<20}{_size(snapshot):>16}{_size(delta):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Batch tick engine vs per-request tick math.
+
+Builds N synthetic active tanks and times one full pass both ways: calling
+derive_tank + needs_rebase for every user in pure Python (what N ticks cost
+the request path), and one vectorized TickEngine.advance over all rows.
+Needs NumPy.
+
+    cd backend
+    python -m benchmarks.tick_engine --tanks 10000 100000
+"""
+
+import argparse
+from datetime import timedelta
+import random
+import time
+
+from app.models import now_utc
+from app.simulation import derive_tank, needs_rebase
+from app.tick_engine import TickEngine, np
+
+
+def synthetic_users(count: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    now = now_utc()
+    users = []
+    for i in range(count):
+        fish = rng.randint(0, 10)
+        users.append({
+            "username": f"player{i}",
+            "gameState": {"lastActiveAt": now - timedelta(seconds=rng.uniform(0, 400))},
+            "tank": {
+                "hunger": rng.uniform(0, 100),
+                "poopPositions": [{"id": f"p{i}-{n}"} for n in range(rng.randint(0, 3))],
+                "lastPoopTime": now - timedelta(seconds=rng.uniform(0, 600)),
+            },
+            "fish": [{}] * fish,
+        })
+    return users
+
+
+def per_request(users: list[dict], now) -> float:
+    started = time.perf_counter()
+    for user in users:
+        derive_tank(user, now)
+        needs_rebase(user, now)
+    return time.perf_counter() - started
+
+
+def batch(engine: TickEngine, now) -> tuple[float, int]:
+    started = time.perf_counter()
+    due, _ = engine.advance(now.timestamp())
+    return time.perf_counter() - started, len(due)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tanks", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--passes", type=int, default=5)
+    args = parser.parse_args()
+    if np is None:
+        raise SystemExit("NumPy is not installed")
+
+    print(f"{'tanks':>8}{'python ms':>12}{'batch ms':>10}{'speedup':>9}{'due':>8}{'array MB':>10}")
+    for count in args.tanks:
+        users = synthetic_users(count)
+        now = now_utc()
+        engine = TickEngine(count)
+        for user in users:
+            engine.track(user, now.timestamp())
+
+        python_s = min(per_request(users, now) for _ in range(args.passes))
+        batch_s, due = min(batch(engine, now) for _ in range(args.passes))
+        array_mb = sum(
+            value.nbytes for value in vars(engine).values() if isinstance(value, np.ndarray)
+        ) / 1e6
+        print(
+            f"{count:>8}{python_s * 1e3:>12.1f}{batch_s * 1e3:>10.2f}"
+            f"{python_s / batch_s:>8.0f}x{due:>8}{array_mb:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
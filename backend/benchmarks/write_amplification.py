@@ -0,0 +1,107 @@
+"""
+Write amplification of whole-row vs section-granular saves.
+
+For a player with a full tank, replays the save each mutating route performs
+and reports the column bytes serialized and handed to SQLite, the encode time,
+and the WAL bytes appended, once as a whole-row upsert (the old save_user) and
+once with only the changed sections.
+
+    cd backend
+    python -m benchmarks.write_amplification --repeat 200
+"""
+
+import argparse
+from datetime import datetime, timezone
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SQLITE_PATH", os.path.join(tempfile.mkdtemp(), "bench.sqlite"))
+os.environ["USER_CACHE_SIZE"] = "0"
+
+import asyncio  # noqa: E402
+
+from app import database  # noqa: E402
+from benchmarks.fixtures import full_tank_user  # noqa: E402
+
+
+# Sections each mutating route passes to save_user, and whether it narrows
+# the "fish" section to the one fish it touched (fish_ids=...).
+ROUTE_SECTIONS = {
+    "POST /game/tick": (("gameState", "tank"), False),
+    "POST /game/feed": (("tank", "gameState"), False),
+    "DELETE /game/poop/{id}": (("tank", "gameState"), False),
+    "PATCH /fish/{id}/name": (("fish",), True),
+    "POST /shop/buy/{id}": (("gameState", "ownedAccessories"), False),
+    "POST /fishing/keep": (("fish", "tank", "gameState"), True),
+    "POST /fishing/release": (("gameState",), False),
+}
+
+
+def _changed(user: dict, sections: tuple, one_fish: bool) -> frozenset:
+    """The ``changed`` set save_user builds for these arguments"""
+    changed = frozenset(sections)
+    if one_fish:
+        changed = (changed - {"fish"}) | {("fish", user["fish"][0]["id"])}
+    return changed
+
+
+def _payload_bytes(op: list[tuple]) -> int:
+    """String bytes bound across every statement of one write op"""
+    return sum(
+        len(value.encode())
+        for _, params in op
+        for value in params
+        if isinstance(value, str)
+    )
+
+
+def _wal_size() -> int:
+    wal = database.sqlite_path() + "-wal"
+    return os.path.getsize(wal) if os.path.exists(wal) else 0
+
+
+def measure(user: dict, changed, repeat: int) -> tuple[int, float, int]:
+    conn = database._connect()
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    before = _wal_size()
+    encode_seconds = 0.0
+    for _ in range(repeat):
+        # Every real save bumps updatedAt; identical rows would be skipped.
+        user["updatedAt"] = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        op = database._write_op(user, changed)
+        encode_seconds += time.perf_counter() - started
+        database._write_rows([op])
+    encode_us = encode_seconds / repeat * 1e6
+    return _payload_bytes(op), encode_us, (_wal_size() - before) // repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    asyncio.run(database.connect_to_mongo())
+    database._connect().execute("PRAGMA wal_autocheckpoint = 0")
+    user = full_tank_user("full_tank")
+    database._write_users([user])
+
+    print(
+        f"{'route':<26}{'row bytes':>10}{'patch bytes':>12}"
+        f"{'row enc us':>11}{'patch enc us':>13}{'row WAL/op':>11}{'patch WAL/op':>13}"
+    )
+    for route, (sections, one_fish) in ROUTE_SECTIONS.items():
+        row_bytes, row_us, row_wal = measure(user, None, args.repeat)
+        changed = _changed(user, sections, one_fish)
+        patch_bytes, patch_us, patch_wal = measure(user, changed, args.repeat)
+        print(
+            f"{route:<26}{row_bytes:>10}{patch_bytes:>12}"
+            f"{row_us:>11.1f}{patch_us:>13.1f}{row_wal:>11}{patch_wal:>13}"
+        )
+
+    asyncio.run(database.close_mongo_connection())
+
+
+if __name__ == "__main__":
+    main()
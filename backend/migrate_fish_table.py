@@ -0,0 +1,58 @@
+"""
+Online migration: users.fish JSON arrays -> normalized fish table.
+
+Safe to run while the app is serving traffic. Users are moved in small
+batches, each in its own short transaction, and the app reads either layout
+until a user's fish have been moved.
+
+    cd backend
+    SQLITE_PATH=/data/aquarium.sqlite python migrate_fish_table.py
+
+Set FISH_MIGRATION_BATCH (default 100 users) and FISH_MIGRATION_PAUSE
+(default 0.05 seconds between batches) to trade speed for write-lock time.
+"""
+
+import asyncio
+import os
+import time
+
+from app.database import (
+    connect_to_mongo, close_mongo_connection, legacy_fish_user_count,
+    migrate_legacy_fish_batch, sqlite_path,
+)
+
+
+BATCH_SIZE = int(os.getenv("FISH_MIGRATION_BATCH", "100"))
+PAUSE_SECONDS = float(os.getenv("FISH_MIGRATION_PAUSE", "0.05"))
+
+
+async def run_migration():
+    print("=" * 60)
+    print("Cozy Aquarium fish JSON -> fish table migration")
+    print("=" * 60)
+    print(f"SQLite: {sqlite_path()}")
+
+    await connect_to_mongo()
+    remaining = legacy_fish_user_count()
+    print(f"\nUsers with legacy fish JSON: {remaining}")
+    if remaining == 0:
+        print("Nothing to migrate. Done.")
+        await close_mongo_connection()
+        return
+
+    migrated = 0
+    while True:
+        moved = migrate_legacy_fish_batch(BATCH_SIZE)
+        if moved == 0:
+            break
+        migrated += moved
+        print(f"  migrated {migrated}/{remaining} users")
+        time.sleep(PAUSE_SECONDS)
+
+    await close_mongo_connection()
+    print("\nMigration complete.")
+    print(f"Migrated: {migrated}")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_migration())
@@ -0,0 +1,29 @@
+import os
+import tempfile
+import uuid
+
+# Configure the app before it is imported: a throwaway database, and no
+# sign-in rate limit since every test signs a new player in
+_db_dir = tempfile.mkdtemp(prefix="aquarium-tests-")
+os.environ["SQLITE_PATH"] = os.path.join(_db_dir, "aquarium.sqlite")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def player(client):
+    """A freshly signed-up player; ``client`` now carries their session cookie"""
+    username = f"player{uuid.uuid4().hex[:8]}"
+    response = client.post("/api/sessions", json={"username": username, "password": "password1"})
+    assert response.status_code == 200
+    return username
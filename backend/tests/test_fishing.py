@@ -0,0 +1,89 @@
+from app.routers import fishing
+
+
+def _catch(client, spawn):
+    return client.post(
+        f"/api/fishing/catch/{spawn['id']}",
+        params={"species": spawn["species"], "size": spawn["size"], "rarity": spawn["rarity"]},
+    )
+
+
+def test_timeline_spawn_can_only_be_caught_once(client, player):
+    timeline = client.get("/api/fishing/timeline").json()
+    seed, epoch = fishing._timelines[player]
+    current = fishing._wave_at(epoch, fishing.time.time())
+    spawn = next(s for s in timeline["spawns"] if s["wave"] == current)
+
+    assert _catch(client, spawn).status_code == 200
+    repeat = _catch(client, spawn)
+    assert repeat.status_code == 404
+    assert repeat.json()["detail"] == "That fish already swam away"
+    assert (seed, current, spawn["id"]) in fishing._timeline_catches[player]
+
+
+def test_spawn_batch_catch_works_after_fetching_timeline(client, player):
+    client.get("/api/fishing/timeline")
+    spawn = client.get("/api/fishing/spawn").json()["spawns"][0]
+
+    assert _catch(client, spawn).status_code == 200
+    assert _catch(client, spawn).status_code == 404
+
+
+def test_unknown_spawn_is_rejected(client, player):
+    client.get("/api/fishing/spawn")
+    response = client.post(
+        "/api/fishing/catch/not-a-spawn", params={"species": "goldfish", "rarity": "legendary"}
+    )
+    assert response.status_code == 404
+
+
+def test_catch_needs_a_spawn_the_server_handed_out(client, player):
+    response = client.post(
+        "/api/fishing/catch/fake1", params={"species": "goldfish", "rarity": "legendary"}
+    )
+    assert response.status_code == 404
+
+
+def test_catch_ignores_client_rarity(client, player):
+    spawn = client.get("/api/fishing/spawn").json()["spawns"][0]
+    for _ in range(20):
+        response = client.post(
+            f"/api/fishing/catch/{spawn['id']}", params={"rarity": "legendary", "size": "lg"}
+        )
+        if response.json()["resultType"] == "fish":
+            assert response.json()["fish"]["rarity"] == spawn["rarity"]
+            assert response.json()["fish"]["size"] == spawn["size"]
+            return
+        spawn = client.get("/api/fishing/spawn").json()["spawns"][0]
+
+
+def test_catch_rejects_unknown_rarity_and_size(client, player):
+    spawn = client.get("/api/fishing/spawn").json()["spawns"][0]
+    response = client.post(
+        f"/api/fishing/catch/{spawn['id']}", params={"rarity": "mythic", "size": "huge"}
+    )
+    assert response.status_code == 422
+
+
+def _catch_a_fish(client):
+    while True:
+        spawn = client.get("/api/fishing/spawn").json()["spawns"][0]
+        response = _catch(client, spawn).json()
+        if response["resultType"] == "fish":
+            return response["fish"]
+
+
+def test_swap_returns_fish_in_response_shape(client, player):
+    kept = _catch_a_fish(client)
+    assert client.post("/api/fishing/keep", json={"fishId": kept["id"]}).status_code == 200
+    caught = _catch_a_fish(client)
+
+    response = client.post(
+        "/api/fishing/swap", json={"caughtFishId": caught["id"], "releaseFishId": kept["id"]}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["releasedFish"]["id"] == kept["id"]
+    assert "revision" not in body["releasedFish"]
+    assert set(body["addedFish"]) == set(body["releasedFish"])
@@ -0,0 +1,42 @@
+from app.fish_fragments import fish_fragments
+
+
+def _add_fish(client, name="Bubbles"):
+    response = client.post(
+        "/api/fish", json={"species": "goldfish", "name": name, "color": "#FF8844", "size": "md"}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_failing_action_rolls_back_the_whole_batch(client, player):
+    fish = _add_fish(client)
+    before = client.get("/api/game").json()
+    assert (player, fish["id"]) in fish_fragments._entries
+
+    response = client.post("/api/game/actions", json={"actions": [
+        {"type": "renameFish", "fishId": fish["id"], "name": "Renamed"},
+        {"type": "releaseFish", "fishId": fish["id"]},
+        {"type": "renameFish", "fishId": "no-such-fish", "name": "Ghost"},
+    ]})
+
+    assert response.status_code == 404
+    assert response.json()["detail"].startswith("Action 2 (renameFish) failed")
+    after = client.get("/api/game").json()
+    assert after["fish"] == before["fish"]
+    assert after["gameState"]["coins"] == before["gameState"]["coins"]
+    # Nothing was saved, so the fish's fragment is still current
+    assert (player, fish["id"]) in fish_fragments._entries
+
+
+def test_successful_batch_refreshes_fish_fragments(client, player):
+    fish = _add_fish(client)
+    client.get("/api/game")
+
+    response = client.post("/api/game/actions", json={"actions": [
+        {"type": "renameFish", "fishId": fish["id"], "name": "Renamed"},
+    ]})
+
+    assert response.status_code == 200
+    assert (player, fish["id"]) not in fish_fragments._entries
+    assert client.get("/api/game").json()["fish"][0]["name"] == "Renamed"
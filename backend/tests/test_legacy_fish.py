@@ -0,0 +1,30 @@
+import json
+
+from app import database
+
+
+def _insert_legacy_user(username: str, fish: list[dict]) -> None:
+    conn = database._connect()
+    with database._locked():
+        conn.execute(
+            "INSERT INTO users (username, game_state, tank, fish) VALUES (?, '{}', '{}', ?)",
+            (username, json.dumps(fish)),
+        )
+        conn.commit()
+
+
+def test_legacy_fish_ids_are_stable_across_uncached_reads(client):
+    legacy = [
+        {"species": "goldfish", "name": "Bubbles"},
+        {"id": "dup", "species": "koi", "name": "Finn"},
+        {"id": "dup", "species": "koi", "name": "Coral"},
+    ]
+    _insert_legacy_user("legacyuser", legacy)
+
+    # _fetch_user reads past the user cache, as every read does with USER_CACHE_SIZE=0
+    first = [fish["id"] for fish in database._fetch_user("legacyuser")["fish"]]
+    second = [fish["id"] for fish in database._fetch_user("legacyuser")["fish"]]
+
+    assert first == second
+    assert first[1] == "dup"
+    assert len(set(first)) == 3
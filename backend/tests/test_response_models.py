@@ -0,0 +1,63 @@
+"""
+The hot routes skip FastAPI's response validation (see app/responses.py), so
+these check their bodies still match the response models: every body must
+validate, and dumping the parsed model must give the body back, so fields
+the model doesn't know about or silently fills with defaults show up too.
+"""
+
+import json
+
+import pytest
+
+from app.models import (
+    FishingSpawnsResponse, GameStateResponse, ShopItemsResponse, TickResponse
+)
+
+
+def _utc_z(value):
+    # orjson writes UTC as +00:00, pydantic as Z; both are the same instant
+    if isinstance(value, dict):
+        return {key: _utc_z(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_utc_z(item) for item in value]
+    if isinstance(value, str) and value.endswith("+00:00"):
+        return value[:-6] + "Z"
+    return value
+
+
+def assert_matches(model, body: bytes) -> None:
+    parsed = model.model_validate_json(body)
+    assert parsed.model_dump(mode="json") == _utc_z(json.loads(body))
+
+
+@pytest.fixture
+def tank_with_fish(client, player):
+    response = client.post(
+        "/api/fish", json={"species": "goldfish", "name": "Bubbles", "color": "#FF8844", "size": "sm"}
+    )
+    assert response.status_code == 200
+    return player
+
+
+def test_game_state_matches_model(client, tank_with_fish):
+    response = client.get("/api/game")
+    assert response.status_code == 200
+    assert_matches(GameStateResponse, response.content)
+
+
+def test_tick_matches_model(client, tank_with_fish):
+    response = client.post("/api/game/tick")
+    assert response.status_code == 200
+    assert_matches(TickResponse, response.content)
+
+
+def test_fishing_spawns_match_model(client, player):
+    response = client.get("/api/fishing/spawn")
+    assert response.status_code == 200
+    assert_matches(FishingSpawnsResponse, response.content)
+
+
+def test_shop_items_match_model(client, player):
+    response = client.get("/api/shop/items")
+    assert response.status_code == 200
+    assert_matches(ShopItemsResponse, response.content)
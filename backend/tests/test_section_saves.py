@@ -0,0 +1,59 @@
+import copy
+import sqlite3
+
+import pytest
+
+from app import database
+from app.models import now_utc
+
+
+def _row(username: str) -> dict:
+    conn = sqlite3.connect(database.SQLITE_PATH)
+    conn.row_factory = sqlite3.Row
+    try:
+        user = dict(conn.execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone())
+        user["fish rows"] = [
+            dict(row) for row in conn.execute(
+                "SELECT * FROM fish WHERE username = ? ORDER BY fish_id", (username,)
+            )
+        ]
+    finally:
+        conn.close()
+    return user
+
+
+def _change_everything(user: dict) -> dict:
+    changed = copy.deepcopy(user)
+    changed["password_hash"] = "changed-hash"
+    changed["gameState"]["coins"] = 98765
+    changed["tank"]["hunger"] = 12
+    changed["ownedAccessories"] = ["tophat"]
+    changed["fish"].append({
+        "id": "section-test-fish", "species": "goldfish", "name": "Sectioned",
+        "color": "#ffaa00", "size": "md", "rarity": "common", "createdAt": now_utc(),
+    })
+    changed["updatedAt"] = now_utc()
+    changed["version"] = user.get("version", 0) + 1
+    return changed
+
+
+@pytest.mark.parametrize("changed, columns", [
+    (frozenset({"password_hash"}), {"password_hash"}),
+    (frozenset({"gameState"}), {"game_state"}),
+    (frozenset({"tank"}), {"tank"}),
+    (frozenset({"ownedAccessories"}), {"owned_accessories"}),
+    (frozenset({"gameState", "tank"}), {"game_state", "tank"}),
+    (frozenset({("fish", "section-test-fish")}), {"fish rows"}),
+    (frozenset({"fish"}), {"fish rows"}),
+])
+def test_section_save_leaves_other_columns_alone(client, player, changed, columns):
+    # Settle the sign-up write so the row below is what the cache would write
+    client.portal.call(database.flush_user_cache)
+    user = client.portal.call(database.get_user, player)
+    before = _row(player)
+
+    database._write_rows([database._write_op(_change_everything(user), changed)])
+
+    after = _row(player)
+    differs = {column for column in before if before[column] != after[column]}
+    assert differs == columns | {"updated_at", "version"}
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+import pytest
+
+from app.game_config import HUNGER_DECAY_PER_MINUTE, MAX_CATCH_UP_SECONDS, REBASE_AFTER_SECONDS
+from app.models import now_utc
+from app.simulation import derive_tank, materialize, needs_rebase
+
+
+def _user(start):
+    return {
+        "username": "sim",
+        "fish": [],
+        "tank": {"hunger": 100, "cleanliness": 100, "poopPositions": [], "lastPoopTime": start},
+        "gameState": {"lastActiveAt": start},
+    }
+
+
+def test_rebase_is_due_before_the_catch_up_cap():
+    start = now_utc()
+    user = _user(start)
+
+    assert not needs_rebase(user, start + timedelta(seconds=REBASE_AFTER_SECONDS - 1))
+    assert needs_rebase(user, start + timedelta(seconds=REBASE_AFTER_SECONDS))
+    assert REBASE_AFTER_SECONDS < MAX_CATCH_UP_SECONDS
+
+
+def test_late_ticks_during_play_keep_all_the_decay():
+    # A minute-apart tick that lands a little late must not drop any decay
+    start = now_utc()
+    user = _user(start)
+    now = start
+    for _ in range(10):
+        now += timedelta(seconds=65)
+        if needs_rebase(user, now):
+            materialize(user, now)
+
+    expected = 100 - HUNGER_DECAY_PER_MINUTE * (now - start).total_seconds() / 60
+    assert derive_tank(user, now)["hunger"] == pytest.approx(expected)
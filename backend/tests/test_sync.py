@@ -0,0 +1,80 @@
+from app.models import now_utc
+from app.routers import game
+from app.sync_log import sync_log
+
+
+def _add_fish(client, name):
+    response = client.post(
+        "/api/fish", json={"species": "goldfish", "name": name, "color": "#FF8844", "size": "md"}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _sync(client, since=None):
+    params = {} if since is None else {"since": since}
+    response = client.get("/api/game/sync", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_unchanged_state_keeps_the_cursor(client, player, monkeypatch):
+    # Hunger decays continuously, so hold the clock still between syncs
+    frozen = now_utc()
+    monkeypatch.setattr(game, "now_utc", lambda: frozen)
+    first = _sync(client)
+    assert first["full"] is True
+
+    again = _sync(client, first["cursor"])
+
+    assert again == {"cursor": first["cursor"], "full": False}
+
+
+def test_changed_fish_is_upserted(client, player):
+    fish = _add_fish(client, "Bubbles")
+    first = _sync(client)
+
+    renamed = client.patch(f"/api/fish/{fish['id']}/name", json={"name": "Renamed"})
+    assert renamed.status_code == 200
+    changes = _sync(client, first["cursor"])
+
+    assert changes["full"] is False
+    assert changes["cursor"] != first["cursor"]
+    assert [f["name"] for f in changes["fishUpserted"]] == ["Renamed"]
+    assert "fishRemoved" not in changes
+
+
+def test_removed_fish_is_listed(client, player):
+    kept = _add_fish(client, "Stays")
+    released = _add_fish(client, "Goes")
+    first = _sync(client)
+
+    assert client.delete(f"/api/fish/{released['id']}").status_code == 200
+    changes = _sync(client, first["cursor"])
+
+    assert changes["full"] is False
+    assert changes["fishRemoved"] == [released["id"]]
+    assert kept["id"] not in [f["id"] for f in changes.get("fishUpserted", [])]
+
+
+def test_unknown_cursor_falls_back_to_full_sync(client, player):
+    _sync(client)
+
+    response = _sync(client, 12345)
+
+    assert response["full"] is True
+    assert "fish" in response and "gameState" in response
+
+
+def test_evicted_cursor_falls_back_to_full_sync(client, player, monkeypatch):
+    monkeypatch.setattr(sync_log, "depth", 1)
+    first = _sync(client)
+    _add_fish(client, "Newcomer")
+    second = _sync(client, first["cursor"])
+    assert second["full"] is False
+
+    # Only the latest cursor is remembered now
+    stale = _sync(client, first["cursor"])
+
+    assert stale["full"] is True
+    assert [f["name"] for f in stale["fish"]] == ["Newcomer"]
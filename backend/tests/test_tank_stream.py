@@ -0,0 +1,21 @@
+from app import tank_stream
+
+
+def test_stream_capacity_is_capped_by_the_user_cache():
+    assert tank_stream.stream_capacity(2000, 1024) == 1024
+    assert tank_stream.stream_capacity(100, 1024) == 100
+    # Write-through: no cache to thrash
+    assert tank_stream.stream_capacity(2000, 0) == 2000
+
+
+def test_stream_is_refused_when_every_slot_is_taken(client, player, monkeypatch):
+    streams = tank_stream.tank_streams
+    monkeypatch.setattr(streams, "max_connections", streams.open)
+    rejected = streams.rejected
+
+    response = client.get("/api/game/stream")
+
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    assert streams.rejected == rejected + 1
+    assert streams.open <= streams.max_connections
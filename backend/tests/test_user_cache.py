@@ -0,0 +1,57 @@
+import uuid
+
+from app import database
+
+
+def _sign_up(client) -> str:
+    username = f"player{uuid.uuid4().hex[:8]}"
+    response = client.post("/api/sessions", json={"username": username, "password": "password1"})
+    assert response.status_code == 200
+    return username
+
+
+def _set_coins(client, username: str, coins: int) -> None:
+    async def save():
+        user = await database.get_user(username)
+        user["gameState"]["coins"] = coins
+        await database.save_user(user, ("gameState",))
+
+    client.portal.call(save)
+
+
+def _stored_coins(username: str) -> int:
+    # Straight from SQLite, past the cache
+    return database._fetch_user(username)["gameState"]["coins"]
+
+
+def test_flush_writes_dirty_users(client, player):
+    _set_coins(client, player, 4321)
+    assert database._cache.peek(player)["gameState"]["coins"] == 4321
+
+    client.portal.call(database.flush_user_cache)
+
+    assert _stored_coins(player) == 4321
+    assert database.cache_stats()["dirty"] == 0
+
+
+def test_evicted_dirty_user_is_written_back(client, player, monkeypatch):
+    other = _sign_up(client)
+    monkeypatch.setattr(database._cache, "max_size", 1)
+
+    _set_coins(client, player, 1234)
+    # Loading another player pushes the dirty one out of the one-entry cache
+    client.portal.call(database.get_user, other)
+
+    assert database._cache.peek(player) is None
+    assert _stored_coins(player) == 1234
+
+
+def test_shutdown_flushes_and_reopened_database_keeps_writes(client, player):
+    _set_coins(client, player, 777)
+
+    client.portal.call(database.close_mongo_connection)
+    client.portal.call(database.connect_to_mongo)
+
+    assert database._cache.peek(player) is None
+    assert _stored_coins(player) == 777
+    assert client.portal.call(database.get_user, player)["gameState"]["coins"] == 777
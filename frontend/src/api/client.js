@@ -76,6 +76,20 @@ export const api = {
    */
   getGameState: () => fetchAPI('/game'),
 
+  /**
+   * Get what changed since an earlier sync's cursor
+   * (a full snapshot with full: true when there is no usable cursor)
+   */
+  syncGame: (since) =>
+    fetchAPI(`/game/sync${since ? `?since=${since}` : ''}`),
+
+  /**
+   * Open the server-sent event stream of tank updates ("tank" events,
+   * same body as gameTick)
+   */
+  streamGame: () =>
+    new EventSource(`${API_BASE_URL}/game/stream`, { withCredentials: true }),
+
   /**
    * Update game state (hunger decay, poop generation)
    * Called periodically during active play
@@ -101,6 +115,16 @@ export const api = {
   cleanPoop: (poopId) =>
     fetchAPI(`/game/poop/${poopId}`, { method: 'DELETE' }),
 
+  /**
+   * Apply several actions in one request (all or nothing)
+   * e.g. [{ type: 'removePoop', poopId }, { type: 'renameFish', fishId, name }]
+   */
+  applyActions: (actions) =>
+    fetchAPI('/game/actions', {
+      method: 'POST',
+      body: JSON.stringify({ actions }),
+    }),
+
   /**
    * Add coins (e.g., from collecting in the lake)
    */
@@ -153,6 +177,12 @@ export const api = {
    */
   getFishingSpawns: () => fetchAPI('/fishing/spawn'),
 
+  /**
+   * Get the seeded spawn timeline for the next minute of lake waves
+   */
+  getSpawnTimeline: (seconds) =>
+    fetchAPI(`/fishing/timeline${seconds ? `?seconds=${seconds}` : ''}`),
+
   /**
    * Attempt to catch a fish
    * Pass spawn data to ensure caught fish matches silhouette
@@ -169,29 +199,30 @@ export const api = {
 
   /**
    * Keep a caught fish (add to tank)
+   * The server holds the caught fish; only its id is sent back
    */
-  keepFish: (fishData) =>
+  keepFish: (fishId) =>
     fetchAPI('/fishing/keep', {
       method: 'POST',
-      body: JSON.stringify(fishData),
+      body: JSON.stringify({ fishId }),
     }),
 
   /**
    * Release caught fish for coins
    */
-  releaseForCoins: (fishData) =>
+  releaseForCoins: (fishId) =>
     fetchAPI('/fishing/release', {
       method: 'POST',
-      body: JSON.stringify(fishData),
+      body: JSON.stringify({ fishId }),
     }),
 
   /**
    * Swap caught fish with one in tank
    */
-  swapFish: (caughtFish, releaseFishId) =>
-    fetchAPI(`/fishing/swap?release_fish_id=${releaseFishId}`, {
+  swapFish: (caughtFishId, releaseFishId) =>
+    fetchAPI('/fishing/swap', {
       method: 'POST',
-      body: JSON.stringify(caughtFish),
+      body: JSON.stringify({ caughtFishId, releaseFishId }),
     }),
 
   // ============================================
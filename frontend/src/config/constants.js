@@ -328,6 +328,13 @@ export const GAME_CONFIG = {
   // Minimum time between ticks to prevent spam
   tickDebounceMs: 10000,     // At most once per 10 seconds
   
+  // Receive tank updates over a server-sent event stream (GET /game/stream)
+  // instead of polling; ticks resume automatically while it is disconnected
+  useTankStream: true,
+  
+  // Poop scrubbed within this window is removed in one batched request
+  poopBatchMs: 300,
+  
   // These mirror backend values for UI calculations
   hungerDecayPerMinute: 1.0, // Matches backend HUNGER_DECAY_PER_MINUTE
   feedRestore: 25.0,         // Matches backend HUNGER_FEED_RESTORE
@@ -384,6 +391,11 @@ export const FISHING_CONFIG = {
   spawnRefreshMs: 6000,          // How often new fish spawn (milliseconds)
                                   // HIGHER = fish feel more scarce
                                   // LOWER = constant action
+                                  // Signed-in players get waves of SPAWN_WAVE_SECONDS
+                                  // from the backend's spawn timeline instead
+  
+  timelineCheckMs: 1000,          // How often to check for the next timeline wave
+                                  // (local only; the timeline is fetched about once a minute)
   
   silhouetteCount: { 
     min: 3,                       // Minimum fish on screen
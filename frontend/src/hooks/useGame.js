@@ -20,8 +20,12 @@ export function useGame() {
   const [error, setError] = useState(null);
   
   const tickIntervalRef = useRef(null);
+  const syncCursorRef = useRef(null);
   const lastTickRef = useRef(0);
   const isTickingRef = useRef(false);
+  const streamingRef = useRef(false);
+  const poopQueueRef = useRef([]);
+  const poopBatchRef = useRef(null);
 
   // Fetch full game state
   const fetchGameState = useCallback(async () => {
@@ -41,12 +45,88 @@ export function useGame() {
     }
   }, []);
 
+  // Refresh via delta sync: only what changed since the last sync is sent
+  const syncGameState = useCallback(async () => {
+    try {
+      const data = await api.syncGame(syncCursorRef.current);
+      syncCursorRef.current = data.cursor;
+
+      if (data.full) {
+        setGameState(data.gameState);
+        setTank(data.tank);
+        setFish(data.fish);
+        setOwnedAccessories(data.ownedAccessories);
+        setHappiness(data.happiness);
+        return;
+      }
+
+      if (data.gameState) {
+        setGameState(prev => ({ ...prev, ...data.gameState }));
+      }
+      if (data.tank || data.poopAdded || data.poopRemoved) {
+        setTank(prev => {
+          const removed = new Set(data.poopRemoved || []);
+          const kept = (prev?.poopPositions || []).filter(p => !removed.has(p.id));
+          const known = new Set(kept.map(p => p.id));
+          const added = (data.poopAdded || []).filter(p => !known.has(p.id));
+          return { ...prev, ...data.tank, poopPositions: [...kept, ...added] };
+        });
+      }
+      if (data.fishUpserted || data.fishRemoved) {
+        setFish(prev => {
+          const removed = new Set(data.fishRemoved || []);
+          const upserted = new Map((data.fishUpserted || []).map(f => [f.id, f]));
+          const next = prev
+            .filter(f => !removed.has(f.id))
+            .map(f => {
+              const updated = upserted.get(f.id);
+              upserted.delete(f.id);
+              return updated || f;
+            });
+          return [...next, ...upserted.values()];
+        });
+      }
+      if (data.ownedAccessories) {
+        setOwnedAccessories(data.ownedAccessories);
+      }
+      if (data.happiness !== undefined) {
+        setHappiness(data.happiness);
+      }
+      setError(null);
+    } catch (err) {
+      setError(err.message);
+    }
+  }, []);
+
+  // Apply a tick body (from POST /game/tick or a "tank" stream event)
+  const applyTick = useCallback((data) => {
+    setTank(prev => ({
+      ...prev,
+      hunger: data.hunger,
+      cleanliness: data.cleanliness,
+      poopPositions: data.poopPositions || prev?.poopPositions || [],
+    }));
+    
+    setGameState(prev => ({
+      ...prev,
+      maxFish: data.maxFish,
+      coins: data.coins,
+    }));
+    
+    setHappiness(data.happiness);
+  }, []);
+
   // Game tick - update hunger, poop
   // Debounced to prevent excessive server calls
   const gameTick = useCallback(async () => {
     if (document.visibilityState !== 'visible') {
       return;
     }
+    
+    // The open stream already pushes every change
+    if (streamingRef.current) {
+      return;
+    }
 
     // Debounce: prevent ticks more frequent than tickDebounceMs
     const now = Date.now();
@@ -68,26 +148,40 @@ export function useGame() {
       const data = await api.gameTick();
       
       // Update local state from tick response
-      setTank(prev => ({
-        ...prev,
-        hunger: data.hunger,
-        cleanliness: data.cleanliness,
-        poopPositions: data.poopPositions || prev?.poopPositions || [],
-      }));
-      
-      setGameState(prev => ({
-        ...prev,
-        maxFish: data.maxFish,
-        coins: data.coins,
-      }));
-      
-      setHappiness(data.happiness);
+      applyTick(data);
     } catch (err) {
       console.error('Game tick error:', err);
     } finally {
       isTickingRef.current = false;
     }
-  }, []);
+  }, [applyTick]);
+
+  // Whether a tank has loaded; effects that don't need its contents depend on this
+  const hasState = !!gameState;
+
+  // Server-pushed tank updates; ticks below only run while this is down
+  useEffect(() => {
+    if (loading || !hasState || !GAME_CONFIG.useTankStream || !window.EventSource) {
+      return;
+    }
+    
+    const source = api.streamGame();
+    source.onopen = () => {
+      streamingRef.current = true;
+    };
+    source.addEventListener('tank', (event) => {
+      applyTick(JSON.parse(event.data));
+    });
+    // EventSource reconnects on its own (and gives up on a 503); poll meanwhile
+    source.onerror = () => {
+      streamingRef.current = false;
+    };
+    
+    return () => {
+      source.close();
+      streamingRef.current = false;
+    };
+  }, [loading, hasState, applyTick]);
 
   // Start periodic game ticks + visibility-based ticks
   useEffect(() => {
@@ -174,25 +268,47 @@ export function useGame() {
     }
   }, [tank?.hunger]);
 
-  // Clean single poop
-  const cleanPoop = useCallback(async (poopId) => {
+  // Send every poop scrubbed within poopBatchMs as one batched request
+  const flushPoop = useCallback(async () => {
+    const poopIds = poopQueueRef.current;
+    poopQueueRef.current = [];
     try {
-      const data = await api.cleanPoop(poopId);
+      const data = await api.applyActions(
+        poopIds.map(poopId => ({ type: 'removePoop', poopId }))
+      );
+      const { newCleanliness } = data.results[data.results.length - 1];
+      const removed = new Set(poopIds);
       
       setTank(prev => ({
         ...prev,
-        cleanliness: data.newCleanliness,
-        poopPositions: prev.poopPositions.filter(p => p.id !== poopId),
+        cleanliness: newCleanliness,
+        poopPositions: prev.poopPositions.filter(p => !removed.has(p.id)),
       }));
       
       // Recalculate happiness
-      setHappiness(((tank?.hunger || 100) + data.newCleanliness) / 2);
+      setHappiness(((tank?.hunger || 100) + newCleanliness) / 2);
       
       return { success: true };
     } catch (err) {
+      // The batch is all-or-nothing; resync in case one poop was already gone
+      syncGameState();
       return { success: false, error: err.message };
     }
-  }, [tank?.hunger]);
+  }, [tank?.hunger, syncGameState]);
+
+  // Clean single poop
+  const cleanPoop = useCallback((poopId) => {
+    poopQueueRef.current.push(poopId);
+    if (!poopBatchRef.current) {
+      poopBatchRef.current = new Promise(resolve => {
+        setTimeout(() => {
+          poopBatchRef.current = null;
+          resolve(flushPoop());
+        }, GAME_CONFIG.poopBatchMs);
+      });
+    }
+    return poopBatchRef.current;
+  }, [flushPoop]);
 
   // Release a fish
   const releaseFish = useCallback(async (fishId) => {
@@ -284,6 +400,6 @@ export function useGame() {
     addFish,
     addCoins,
     updateCoins,
-    refresh: fetchGameState,
+    refresh: syncGameState,
   };
 }
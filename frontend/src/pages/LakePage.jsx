@@ -318,6 +318,9 @@ export function LakePage({ username, isAuthenticated }) {
   const [isTutorialOpen, setIsTutorialOpen] = useState(() => !isAuthenticated && !hasSeenTutorial);
   
   const spawnTimerRef = useRef(null);
+  const timelineRef = useRef(null);
+  const currentWaveRef = useRef(null);
+  const timelineRetryAtRef = useRef(0);
   const coinTimerRef = useRef(null);
   const coinIdRef = useRef(0);
   
@@ -366,30 +369,73 @@ export function LakePage({ username, isAuthenticated }) {
   }, []);
   
   // Spawn fish
+  const loadTimeline = useCallback(async () => {
+    const data = await api.getSpawnTimeline();
+    const skewMs = Date.parse(data.serverTime) - Date.now();
+    const waves = new Map();
+    for (const spawn of data.spawns || []) {
+      const wave = waves.get(spawn.wave) || { startMs: Date.parse(spawn.appearAt), spawns: [] };
+      wave.spawns.push(spawn);
+      waves.set(spawn.wave, wave);
+    }
+    timelineRef.current = {
+      waves,
+      skewMs,
+      waveMs: data.waveSeconds * 1000,
+      untilMs: Date.parse(data.until),
+    };
+  }, []);
+
   const refreshSpawns = useCallback(async () => {
     if (catching || !isPageVisible) return;
     
     if (isAuthenticated) {
-      // Use backend API
+      // Use the backend spawn timeline: one request covers many waves
+      if (Date.now() < timelineRetryAtRef.current) return;
       try {
-        const data = await api.getFishingSpawns();
-        setSpawns(data.spawns || []);
-      } catch (err) {
-        console.error('Spawn error:', err);
+        let timeline = timelineRef.current;
+        if (!timeline || Date.now() + timeline.skewMs >= timeline.untilMs - timeline.waveMs) {
+          await loadTimeline();
+          timeline = timelineRef.current;
+        }
+        const serverNow = Date.now() + timeline.skewMs;
+        for (const [waveId, wave] of timeline.waves) {
+          if (wave.startMs <= serverNow && serverNow < wave.startMs + timeline.waveMs) {
+            if (currentWaveRef.current !== waveId) {
+              currentWaveRef.current = waveId;
+              setSpawns(wave.spawns);
+            }
+            return;
+          }
+        }
+      } catch {
+        // Fall back to polling for one spawn wave at the old cadence
+        timelineRetryAtRef.current = Date.now() + FISHING_CONFIG.spawnRefreshMs;
+        timelineRef.current = null;
+        currentWaveRef.current = null;
+        try {
+          const data = await api.getFishingSpawns();
+          setSpawns(data.spawns || []);
+        } catch (err) {
+          console.error('Spawn error:', err);
+        }
       }
     } else if (localFishingRef.current) {
       // Use local fishing
       const newSpawns = localFishingRef.current.generateSpawns();
       setSpawns(newSpawns);
     }
-  }, [catching, isAuthenticated, isPageVisible]);
+  }, [catching, isAuthenticated, isPageVisible, loadTimeline]);
   
   useEffect(() => {
     if (!isPageVisible) return;
     refreshSpawns();
-    spawnTimerRef.current = setInterval(refreshSpawns, FISHING_CONFIG.spawnRefreshMs);
+    spawnTimerRef.current = setInterval(
+      refreshSpawns,
+      isAuthenticated ? FISHING_CONFIG.timelineCheckMs : FISHING_CONFIG.spawnRefreshMs
+    );
     return () => clearInterval(spawnTimerRef.current);
-  }, [refreshSpawns, isPageVisible]);
+  }, [refreshSpawns, isPageVisible, isAuthenticated]);
   
   // Spawn floating coins periodically (config-driven)
   useEffect(() => {
@@ -505,7 +551,7 @@ export function LakePage({ username, isAuthenticated }) {
     
     if (isAuthenticated) {
       try {
-        await api.keepFish(catchResult.fish);
+        await api.keepFish(catchResult.fish.id);
         game.refresh();
       } catch (err) {
         console.error('Keep error:', err);
@@ -524,7 +570,7 @@ export function LakePage({ username, isAuthenticated }) {
     
     if (isAuthenticated) {
       try {
-        const result = await api.releaseForCoins(catchResult.fish);
+        const result = await api.releaseForCoins(catchResult.fish.id);
         game.updateCoins(result.newCoins);
       } catch (err) {
         console.error('Release error:', err);
@@ -543,7 +589,7 @@ export function LakePage({ username, isAuthenticated }) {
     
     if (isAuthenticated) {
       try {
-        await api.swapFish(catchResult.fish, releaseFishId);
+        await api.swapFish(catchResult.fish.id, releaseFishId);
         game.refresh();
       } catch (err) {
         console.error('Swap error:', err);